@@ -0,0 +1,321 @@
+"""Benchmark refreshes of many meters against the local stub server.
+
+Runs the real SycfgasAPIClient, SycfgasCoordinator and sensor platform of
+the integration inside a minimal Home Assistant instance, with every
+request answered by benchmarks/stub_server.py. Each cycle advances the
+coordinators' schedule by --advance seconds and refreshes all meters, and
+the wall time, requests, peak memory and state writes of every cycle are
+written as JSON to --output.
+
+With --replay the requests are answered from a cassette recorded with the
+record_traffic service instead, one config entry per recorded meter.
+
+Requires Home Assistant and the integration requirements to be installed:
+
+    python benchmarks/bench_refresh.py --meters 20 --cycles 10 --output bench_results.json
+    python benchmarks/bench_refresh.py --replay sycfgas_cassette.jsonl.gz --realtime
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant import config_entries  # noqa: E402
+from homeassistant.const import __version__ as HA_VERSION  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import (  # noqa: E402
+    area_registry as ar,
+    device_registry as dr,
+    entity as entity_helper,
+    entity_registry as er,
+)
+from homeassistant.helpers.entity_platform import EntityPlatform  # noqa: E402
+
+from custom_components.sycfgas import api_client, sensor  # noqa: E402
+from custom_components.sycfgas.const import DOMAIN  # noqa: E402
+from custom_components.sycfgas.coordinator import SycfgasCoordinator  # noqa: E402
+from custom_components.sycfgas.pool import (  # noqa: E402
+    async_acquire_pool,
+    async_release_pool,
+)
+from custom_components.sycfgas.transport import Cassette, ReplayTransport  # noqa: E402
+
+from stub_server import StubConfig, StubServer  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--meters", type=int, default=10, help="number of meters")
+    parser.add_argument(
+        "--meters-per-token", type=int, default=1, help="meters sharing a user token"
+    )
+    parser.add_argument("--cycles", type=int, default=5, help="refresh cycles after setup")
+    parser.add_argument(
+        "--advance",
+        type=float,
+        default=300,
+        help="seconds of schedule time that pass between cycles",
+    )
+    parser.add_argument("--latency", type=float, default=0.05, help="stub latency (s)")
+    parser.add_argument(
+        "--latency-jitter", type=float, default=0.02, help="stub latency jitter (s)"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 503s")
+    parser.add_argument("--history-years", type=int, default=5, help="years with usage")
+    parser.add_argument(
+        "--payments-per-year", type=int, default=4, help="synthetic payments per year"
+    )
+    parser.add_argument(
+        "--balance-step",
+        type=float,
+        default=0.01,
+        help="balance change per account request, 0 keeps responses identical",
+    )
+    parser.add_argument(
+        "--payloads", type=Path, default=None, help="directory of recorded responses"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="stub random seed")
+    parser.add_argument(
+        "--replay", type=Path, default=None, help="cassette to replay instead of the stub"
+    )
+    parser.add_argument(
+        "--realtime",
+        action="store_true",
+        help="replay responses with their recorded duration",
+    )
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="divide recorded durations by this"
+    )
+    parser.add_argument(
+        "--output", type=Path, default=Path("bench_results.json"), help="JSON report"
+    )
+    return parser.parse_args(argv)
+
+
+async def _async_make_hass(config_dir: str) -> HomeAssistant:
+    """Create a Home Assistant instance with the registries loaded."""
+    hass = HomeAssistant(config_dir)
+    hass.config.set_time_zone("Asia/Shanghai")
+    hass.data[entity_helper.DATA_ENTITY_SOURCE] = {}
+    await ar.async_load(hass)
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    return hass
+
+
+async def _async_noop(*_args: Any) -> int:
+    """Stand in for the statistics import, which needs the recorder."""
+    return 0
+
+
+class StateWriteCounter:
+    """Count state writes of the integration's sensors."""
+
+    def __init__(self) -> None:
+        """Wrap the sensor base class."""
+        self.writes = 0
+        original = sensor.SycfgasBaseSensor.async_write_ha_state
+        counter = self
+
+        def async_write_ha_state(entity: sensor.SycfgasBaseSensor) -> None:
+            counter.writes += 1
+            original(entity)
+
+        sensor.SycfgasBaseSensor.async_write_ha_state = async_write_ha_state
+
+
+async def async_run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the benchmark and return the report."""
+    server: StubServer | None = None
+    replay: ReplayTransport | None = None
+    meters = [f"bench-meter-{index:06d}" for index in range(args.meters)]
+    if args.replay is not None:
+        cassette = Cassette.load(str(args.replay))
+        meters = cassette.meters
+        replay = ReplayTransport(cassette, realtime=args.realtime, speed=args.speed)
+    else:
+        server = StubServer(
+            StubConfig(
+                latency=args.latency,
+                latency_jitter=args.latency_jitter,
+                error_rate=args.error_rate,
+                history_years=args.history_years,
+                payments_per_year=args.payments_per_year,
+                balance_step=args.balance_step,
+                payload_dir=args.payloads,
+                seed=args.seed,
+            )
+        )
+        # Every client resolves endpoints against this module global
+        api_client.API_BASE_URL = await server.async_start()
+    source = replay if replay is not None else server
+    writes = StateWriteCounter()
+    tracemalloc.start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _async_make_hass(config_dir)
+        # Hold the shared pool for the whole run so its transport stays in place
+        pool = async_acquire_pool(hass)
+        if replay is not None:
+            pool.transport = replay
+        coordinators: list[SycfgasCoordinator] = []
+        cycles: list[dict[str, Any]] = []
+
+        async def _async_cycle(name: str, action: Any) -> None:
+            source.reset_counters()
+            writes_before = writes.writes
+            tracemalloc.reset_peak()
+            start = time.perf_counter()
+            await action()
+            await hass.async_block_till_done()
+            wall_time = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+            cycles.append(
+                {
+                    "cycle": name,
+                    "wall_time": round(wall_time, 4),
+                    "requests": sum(source.requests.values()),
+                    "requests_by_endpoint": dict(source.requests),
+                    "injected_errors": source.errors,
+                    "state_writes": writes.writes - writes_before,
+                    "traced_memory": current,
+                    "peak_memory": peak,
+                }
+            )
+            _LOGGER.info("%s", cycles[-1])
+
+        async def _async_setup() -> None:
+            for index, meter_uuid in enumerate(meters):
+                entry = config_entries.ConfigEntry(
+                    version=1,
+                    minor_version=1,
+                    domain=DOMAIN,
+                    title=f"bench {index}",
+                    data={
+                        "meter_uuid": meter_uuid,
+                        "user_token": f"bench-token-{index // args.meters_per_token}",
+                        "meter_no": f"{index:08d}",
+                    },
+                    source=config_entries.SOURCE_USER,
+                    options={},
+                )
+                hass.config_entries._entries[entry.entry_id] = entry  # pylint: disable=protected-access
+                coordinator = SycfgasCoordinator(hass, entry)
+                coordinator.statistics.async_import = _async_noop
+                coordinators.append(coordinator)
+                hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+
+            await asyncio.gather(
+                *(coordinator.async_load_cache() for coordinator in coordinators)
+            )
+            await asyncio.gather(
+                *(coordinator.async_refresh() for coordinator in coordinators)
+            )
+            for coordinator in coordinators:
+                entity_platform = EntityPlatform(
+                    hass=hass,
+                    logger=_LOGGER,
+                    domain="sensor",
+                    platform_name=DOMAIN,
+                    platform=sensor,
+                    scan_interval=timedelta(seconds=30),
+                    entity_namespace=None,
+                )
+                await entity_platform.async_setup_entry(coordinator.entry)
+
+        async def _async_refresh_all() -> None:
+            for coordinator in coordinators:
+                # Let the schedule time pass without waiting for it
+                coordinator._next_due = {  # pylint: disable=protected-access
+                    kind: due - args.advance
+                    for kind, due in coordinator._next_due.items()  # pylint: disable=protected-access
+                }
+            await asyncio.gather(
+                *(coordinator.async_refresh() for coordinator in coordinators)
+            )
+
+        await _async_cycle("setup", _async_setup)
+        for cycle in range(args.cycles):
+            await _async_cycle(str(cycle + 1), _async_refresh_all)
+
+        for coordinator in coordinators:
+            await coordinator.async_shutdown()
+        await async_release_pool(hass)
+        await hass.async_stop(force=True)
+
+    tracemalloc.stop()
+    if server is not None:
+        await server.async_stop()
+
+    refresh_cycles = cycles[1:]
+    return {
+        "config": {
+            key: str(value) if isinstance(value, Path) else value
+            for key, value in vars(args).items()
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "homeassistant": HA_VERSION,
+            "platform": platform.platform(),
+            "statistics_import": "skipped",
+            "source": "replay" if replay is not None else "stub",
+        },
+        "meters": len(meters),
+        "cycles": cycles,
+        "summary": {
+            "setup_wall_time": cycles[0]["wall_time"],
+            "setup_requests": cycles[0]["requests"],
+            "mean_cycle_wall_time": round(
+                sum(cycle["wall_time"] for cycle in refresh_cycles)
+                / max(len(refresh_cycles), 1),
+                4,
+            ),
+            "total_requests": sum(cycle["requests"] for cycle in cycles),
+            "total_state_writes": sum(cycle["state_writes"] for cycle in cycles),
+            "peak_memory": max(cycle["peak_memory"] for cycle in cycles),
+            "throughput": round(
+                sum(cycle["requests"] for cycle in cycles)
+                / max(sum(cycle["wall_time"] for cycle in cycles), 1e-9),
+                2,
+            ),
+            "replay_repeated": replay.repeated if replay is not None else None,
+            "replay_misses": replay.misses if replay is not None else None,
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark from the command line."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(async_run(args))
+    args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), "utf-8")
+    summary = report["summary"]
+    print(
+        f"{report['meters']} meters: setup {summary['setup_wall_time']}s "
+        f"({summary['setup_requests']} requests), "
+        f"{summary['mean_cycle_wall_time']}s per cycle, "
+        f"{summary['total_state_writes']} state writes, "
+        f"peak {summary['peak_memory'] / 1024 / 1024:.1f} MiB -> {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
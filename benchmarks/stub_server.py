@@ -0,0 +1,212 @@
+"""Local stand-in for the Sanya Changfeng Gas API used by the benchmarks."""
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+
+ACCT_INFO = "/prod-api/acct/queryAcctInfo"
+IOT_USAGE = "/prod-api/query/iotUsage"
+PAY_RECORD = "/prod-api/query/v1/front/payRecord"
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stub server."""
+
+    latency: float = 0.05  # Seconds added to every response
+    latency_jitter: float = 0.02  # Uniform random extra seconds
+    error_rate: float = 0.0  # Share of requests answered with HTTP 503
+    history_years: int = 5  # Years with usage, ending with the current year
+    payments_per_year: int = 4
+    balance_step: float = 0.01  # Balance change per account request, 0 for none
+    payload_dir: Path | None = None  # Recorded responses that replace synthetic ones
+    seed: int = 0
+
+
+class StubServer:
+    """aiohttp server implementing queryAcctInfo, iotUsage and payRecord.
+
+    Payloads are synthetic and deterministic per meter, unless a recorded
+    response exists in payload_dir as queryAcctInfo.json, payRecord.json or
+    iotUsage_<type>_<query>.json.
+    """
+
+    def __init__(self, config: StubConfig) -> None:
+        """Initialize the server."""
+        self.config = config
+        self.requests: Counter[str] = Counter()
+        self.errors = 0
+        self._random = random.Random(config.seed)
+        self._balances: dict[str, float] = {}
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base URL."""
+        app = web.Application()
+        app.router.add_post(ACCT_INFO, self._handle_acct_info)
+        app.router.add_post(IOT_USAGE, self._handle_iot_usage)
+        app.router.add_get(PAY_RECORD, self._handle_pay_record)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        sockets = site._server.sockets  # pylint: disable=protected-access
+        self.url = f"http://{host}:{sockets[0].getsockname()[1]}"
+        return self.url
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def reset_counters(self) -> None:
+        """Reset the request and error counters."""
+        self.requests.clear()
+        self.errors = 0
+
+    async def _async_respond(self, endpoint: str, body: dict[str, Any]) -> web.Response:
+        """Apply latency and error injection, then send the body."""
+        self.requests[endpoint] += 1
+        config = self.config
+        await asyncio.sleep(config.latency + self._random.uniform(0, config.latency_jitter))
+        if self._random.random() < config.error_rate:
+            self.errors += 1
+            return web.Response(status=503)
+        return web.json_response(body)
+
+    def _recorded(self, name: str) -> dict[str, Any] | None:
+        """Return a recorded response if one exists."""
+        if self.config.payload_dir is None:
+            return None
+        path = self.config.payload_dir / f"{name}.json"
+        if not path.is_file():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    async def _handle_acct_info(self, request: web.Request) -> web.Response:
+        """Return the balance of a meter."""
+        form = await request.post()
+        meter_uuid = str(form.get("meterUuid", ""))
+        body = self._recorded("queryAcctInfo")
+        if body is None:
+            balance = self._balances.get(meter_uuid, 500.0) - self.config.balance_step
+            self._balances[meter_uuid] = balance
+            body = {
+                "responseCode": "100000",
+                "result": {
+                    "accountBalance": f"{balance:.2f}",
+                    "remainQty": "0.00",
+                    "feeTotals": "0.00",
+                    "industryType": 1,
+                    "isGasMeter": True,
+                    "meterInfo": {
+                        "custName": f"用户{meter_uuid[-4:]}",
+                        "meterList": [{"meterNo": meter_uuid[-8:]}],
+                    },
+                },
+            }
+        return await self._async_respond(ACCT_INFO, body)
+
+    async def _handle_iot_usage(self, request: web.Request) -> web.Response:
+        """Return monthly (type 1) or daily (type 0) usage."""
+        form = await request.post()
+        usage_type = str(form.get("type", "0"))
+        query = str(form.get("query", ""))
+        body = self._recorded(f"iotUsage_{usage_type}_{query}")
+        if body is None:
+            if usage_type == "1":
+                data = self._monthly_usage(int(query))
+            else:
+                year, month = (int(part) for part in query.split("-"))
+                data = self._daily_usage(year, month)
+            body = {"responseCode": "100000", "result": {"data": data, "industryType": 1}}
+        return await self._async_respond(IOT_USAGE, body)
+
+    async def _handle_pay_record(self, request: web.Request) -> web.Response:
+        """Return the payments of the requested or default window."""
+        today = date.today()
+        start = request.query.get("startDate") or date(today.year - 1, 1, 1).isoformat()
+        end = request.query.get("endDate") or today.isoformat()
+        body = self._recorded("payRecord")
+        if body is None:
+            body = {
+                "responseCode": "100000",
+                "result": {
+                    "list": self._payments(date.fromisoformat(start), date.fromisoformat(end)),
+                    "userNo": "U0001",
+                    "meterNo": "M0001",
+                    "startDate": start,
+                    "endDate": end,
+                },
+            }
+        return await self._async_respond(PAY_RECORD, body)
+
+    def _first_year(self) -> int:
+        """Return the first year with usage."""
+        return date.today().year - self.config.history_years + 1
+
+    def _monthly_usage(self, year: int) -> list[dict[str, str]]:
+        """Return synthetic monthly usage of a year."""
+        today = date.today()
+        if year < self._first_year() or year > today.year:
+            return []
+        last_month = today.month if year == today.year else 12
+        return [
+            {
+                "readingTime": f"{year}-{month:02d}",
+                "cycleTotalVolume": f"{10 + (year + month) % 7:.1f}",
+                "billAmt": f"{(10 + (year + month) % 7) * 2.8:.2f}",
+            }
+            for month in range(1, last_month + 1)
+        ]
+
+    def _daily_usage(self, year: int, month: int) -> list[dict[str, str]]:
+        """Return synthetic daily usage of a month, up to yesterday."""
+        if year < self._first_year():
+            return []
+        day = date(year, month, 1)
+        yesterday = date.today() - timedelta(days=1)
+        data = []
+        while day.month == month and day <= yesterday:
+            volume = 0.2 + (day.toordinal() % 5) * 0.15
+            data.append(
+                {
+                    "readingTime": day.isoformat(),
+                    "cycleTotalVolume": f"{volume:.2f}",
+                    "billAmt": f"{volume * 2.8:.2f}",
+                    "readingValue": f"{day.toordinal() % 10000}",
+                }
+            )
+            day += timedelta(days=1)
+        return data
+
+    def _payments(self, start: date, end: date) -> list[dict[str, str]]:
+        """Return synthetic payments between two dates, newest first."""
+        per_year = max(self.config.payments_per_year, 1)
+        payments = []
+        for year in range(max(start.year, self._first_year()), end.year + 1):
+            for index in range(self.config.payments_per_year):
+                paid = date(year, 1 + index * 12 // per_year, 15)
+                if start <= paid <= end:
+                    payments.append(
+                        {
+                            "payAmount": "100.00",
+                            "payTime": f"{paid.isoformat()} 10:00:00",
+                            "payStatus": "1",
+                            "payStatusDesc": "成功",
+                            "payWayCode": "WX",
+                            "payWayDesc": "微信",
+                            "paySerialNo": f"P{paid:%Y%m%d}{index}",
+                        }
+                    )
+        return sorted(payments, key=lambda payment: payment["payTime"], reverse=True)
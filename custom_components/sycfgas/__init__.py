@@ -3,31 +3,72 @@ from __future__ import annotations
 
 import logging
 
+from homeassistant.components.recorder import get_instance
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
+from .cache import SycfgasUsageCache
 from .const import DOMAIN
 from .coordinator import SycfgasCoordinator
+from .ledger import SycfgasPaymentLedger
+from .schedule import SycfgasPublishSchedule
+from .services import async_setup_services
+from .snapshot import SycfgasSnapshot
+from .statistics import statistic_ids
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Sanya Changfeng Gas services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Sanya Changfeng Gas from a config entry."""
     coordinator = SycfgasCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_load_cache()
+        # Entities are created from the last snapshot without waiting for the API
+        restored = await coordinator.async_restore_snapshot()
+        if not restored:
+            await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        # Release the shared connection pool taken by the coordinator
+        await coordinator.async_shutdown()
+        raise
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # A restored meter is refreshed in its first slot of the meter or group
+    # timer, so meters do not all refresh at once after a restart
+    coordinator.async_start_polling()
+
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    coordinator: SycfgasCoordinator = hass.data[DOMAIN][entry.entry_id]
+    # The coordinator also updates the entry data, which needs no reload
+    if dict(entry.options) == coordinator.options:
+        return
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -36,3 +77,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         await coordinator.async_shutdown()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data of a deleted config entry."""
+    await SycfgasUsageCache(hass, entry.data["meter_uuid"]).async_remove()
+    await SycfgasPaymentLedger(hass, entry.data["meter_uuid"]).async_remove()
+    await SycfgasSnapshot(hass, entry.data["meter_uuid"]).async_remove()
+    await SycfgasPublishSchedule(hass, entry.data["meter_uuid"]).async_remove()
+    get_instance(hass).async_clear_statistics(
+        list(statistic_ids(entry.data.get("meter_no") or entry.data["meter_uuid"]))
+    )
@@ -1,44 +1,252 @@
 """API client for Sanya Changfeng Gas."""
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import nullcontext
+from functools import partial
 from typing import Any
 
 import aiohttp
 
-from .const import API_BASE_URL, API_ACCT_INFO, API_IOT_USAGE, API_PAY_RECORD
+from .breaker import CircuitBreaker
+from .const import (
+    API_BASE_URL,
+    API_ACCT_INFO,
+    API_IOT_USAGE,
+    API_PAY_RECORD,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    TENANT_ID,
+)
+from .limiter import AdaptiveRateLimiter, is_transient
+from .metrics import SycfgasMetrics
+from .models import UsageSeries
+from .transport import HttpTransport, SycfgasTransport
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class InFlightRequests:
+    """Requests currently being sent, so identical calls share one request.
+
+    Callers with the same key await the same task instead of each sending
+    their own request. The task is shielded, so a cancelled caller does not
+    cancel the request for the others.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self._tasks: dict[tuple[str, ...], asyncio.Task[bytes]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of requests in flight."""
+        return len(self._tasks)
+
+    def __contains__(self, key: tuple[str, ...]) -> bool:
+        """Return True if a request is in flight for the key."""
+        return key in self._tasks
+
+    async def async_run(
+        self,
+        key: tuple[str, ...],
+        request: Callable[[], Awaitable[bytes]],
+    ) -> bytes:
+        """Run the request, or join the one already running for the key."""
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(request())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            _LOGGER.debug("Joining in-flight request %s %s", key[0], key[2])
+        return await asyncio.shield(task)
+
+    def _forget(self, key: tuple[str, ...], task: asyncio.Task[bytes]) -> None:
+        """Forget a finished request."""
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every caller went away
+            task.exception()
+
+
 class SycfgasAPIClient:
     """Client for Sanya Changfeng Gas API."""
 
-    def __init__(self, meter_uuid: str, user_token: str) -> None:
+    def __init__(
+        self,
+        meter_uuid: str,
+        user_token: str,
+        session: aiohttp.ClientSession | None = None,
+        limiter: AdaptiveRateLimiter | None = None,
+        in_flight: InFlightRequests | None = None,
+        breakers: dict[str, CircuitBreaker] | None = None,
+        transport: SycfgasTransport | None = None,
+    ) -> None:
         """Initialize the API client.
 
         Args:
             meter_uuid: Meter UUID
             user_token: User token
+            session: Shared session to borrow, the client creates its own if omitted
+            limiter: Shared limiter every request waits on, unlimited if omitted
+            in_flight: Shared registry used to coalesce identical requests
+            breakers: Shared circuit breakers by endpoint
+            transport: Transport that sends the requests, plain HTTP if omitted
         """
         self.meter_uuid = meter_uuid
         self.user_token = user_token
-        self._session: aiohttp.ClientSession | None = None
+        self._session = session
+        self._owns_session = session is None
+        self._limiter = limiter
+        self._in_flight = in_flight if in_flight is not None else InFlightRequests()
+        self._breakers = breakers if breakers is not None else {}
+        self._transport = transport if transport is not None else HttpTransport()
+        # (endpoint, query) -> (body fingerprint, parsed response)
+        self._responses: dict[tuple[str, str], tuple[bytes, Any]] = {}
+        # Incremented whenever a response differs from the previous one
+        self.changes = 0
+        self.metrics = SycfgasMetrics()
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session."""
-        if self._session is None or self._session.closed:
+        if self._owns_session and (self._session is None or self._session.closed):
             self._session = aiohttp.ClientSession()
         return self._session
 
     async def close(self) -> None:
-        """Close the session."""
-        if self._session and not self._session.closed:
+        """Close the session if the client owns it."""
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
 
+    async def _async_request(
+        self,
+        method: str,
+        endpoint: str,
+        query: str,
+        parser: Callable[[dict[str, Any]], Any] | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Send a request and return the parsed JSON response.
+
+        Concurrent calls for the same (endpoint, meter, query, token) share a
+        single HTTP request. A response whose body is byte-identical to the
+        previous one for the same (endpoint, query) is not decoded again, the
+        previously parsed object is returned instead.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint path
+            query: Query that distinguishes responses of the same endpoint
+            parser: Optional converter applied once to the decoded JSON
+            **kwargs: Extra arguments for the aiohttp request
+        """
+        flight_key = (endpoint, self.meter_uuid, query, self.user_token)
+        if flight_key in self._in_flight:
+            self.metrics.coalesced += 1
+        body = await self._in_flight.async_run(
+            flight_key,
+            partial(self._async_fetch, method, endpoint, **kwargs),
+        )
+
+        key = (endpoint, query)
+        fingerprint = hashlib.blake2b(body, digest_size=16).digest()
+        previous = self._responses.get(key)
+        if previous is not None and previous[0] == fingerprint:
+            self.metrics.unchanged += 1
+            return previous[1]
+
+        start = time.perf_counter()
+        result = json.loads(body)
+        if parser is not None:
+            result = parser(result)
+        self.metrics.parse_time += time.perf_counter() - start
+        self.metrics.parsed += 1
+        self._responses[key] = (fingerprint, result)
+        self.changes += 1
+        return result
+
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        """Return the circuit breaker of an endpoint."""
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker(
+                endpoint, BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT
+            )
+        return breaker
+
+    async def _async_fetch(self, method: str, endpoint: str, **kwargs: Any) -> bytes:
+        """Send a request, retrying transient failures with jittered backoff."""
+        breaker = self._breaker(endpoint)
+        metrics = self.metrics.endpoint(endpoint)
+        attempt = 0
+        while True:
+            breaker.before_request()
+            try:
+                body = await self._async_send(method, endpoint, **kwargs)
+            except Exception as err:
+                metrics.errors += 1
+                if not is_transient(err):
+                    # The endpoint answered, the request itself was refused
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                attempt += 1
+                if attempt >= RETRY_ATTEMPTS:
+                    raise
+                metrics.retries += 1
+                delay = random.uniform(
+                    0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+                )
+                _LOGGER.debug(
+                    "Request to %s failed (%s), retry %d in %.1fs",
+                    endpoint,
+                    err,
+                    attempt,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+            except BaseException:
+                breaker.release_probe()
+                raise
+            else:
+                breaker.record_success()
+                return body
+
+    async def _async_send(self, method: str, endpoint: str, **kwargs: Any) -> bytes:
+        """Send a request through the limiter and return the raw body."""
+        session = await self._get_session()
+        metrics = self.metrics.endpoint(endpoint)
+        async with self._limiter.slot() if self._limiter else nullcontext():
+            # Time only the request itself, not the wait for the limiter
+            start = time.perf_counter()
+            metrics.requests += 1
+            try:
+                body = await self._transport.async_send(
+                    session,
+                    method,
+                    f"{API_BASE_URL}{endpoint}",
+                    timeout=aiohttp.ClientTimeout(total=10),
+                    **kwargs,
+                )
+            finally:
+                elapsed = time.perf_counter() - start
+                metrics.latency.observe(elapsed)
+                self.metrics.network_time += elapsed
+            metrics.bytes += len(body)
+            return body
+
     async def get_account_info(self) -> dict[str, Any]:
         """Get account balance information."""
-        session = await self._get_session()
         headers = {
             "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36",
             "content-type": "application/x-www-form-urlencoded",
@@ -53,34 +261,31 @@ class SycfgasAPIClient:
             "pagePath": "pages/index/index",
             "clientVersion": "1.0.16",
             "channelType": "0",
-            "tenantId": "005600",
+            "tenantId": TENANT_ID,
             "userToken": self.user_token,
         }
 
         try:
-            async with session.post(
-                f"{API_BASE_URL}{API_ACCT_INFO}",
+            return await self._async_request(
+                "post",
+                API_ACCT_INFO,
+                "",
                 headers=headers,
                 data=data,
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as response:
-                response.raise_for_status()
-                result = await response.json()
-                return result
+            )
         except aiohttp.ClientError as err:
             _LOGGER.error("Error getting account info: %s", err)
             raise
 
-    async def get_monthly_usage(self, year: str) -> dict[str, Any]:
+    async def get_monthly_usage(self, year: str) -> UsageSeries | None:
         """Get monthly usage for a year.
 
         Args:
             year: Year in format "YYYY"
 
         Returns:
-            API response with monthly usage data
+            Monthly usage records, None if the query was not successful
         """
-        session = await self._get_session()
         headers = {
             "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36",
             "content-type": "application/x-www-form-urlencoded;charset=UTF-8",
@@ -97,29 +302,27 @@ class SycfgasAPIClient:
         }
 
         try:
-            async with session.post(
-                f"{API_BASE_URL}{API_IOT_USAGE}",
+            return await self._async_request(
+                "post",
+                API_IOT_USAGE,
+                year,
+                parser=UsageSeries.from_response,
                 headers=headers,
                 data=data,
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as response:
-                response.raise_for_status()
-                result = await response.json()
-                return result
+            )
         except aiohttp.ClientError as err:
             _LOGGER.error("Error getting monthly usage: %s", err)
             raise
 
-    async def get_daily_usage(self, year_month: str) -> dict[str, Any]:
+    async def get_daily_usage(self, year_month: str) -> UsageSeries | None:
         """Get daily usage for a month.
 
         Args:
             year_month: Year and month in format "YYYY-MM"
 
         Returns:
-            API response with daily usage data
+            Daily usage records, None if the query was not successful
         """
-        session = await self._get_session()
         headers = {
             "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36",
             "content-type": "application/x-www-form-urlencoded;charset=UTF-8",
@@ -136,22 +339,27 @@ class SycfgasAPIClient:
         }
 
         try:
-            async with session.post(
-                f"{API_BASE_URL}{API_IOT_USAGE}",
+            return await self._async_request(
+                "post",
+                API_IOT_USAGE,
+                year_month,
+                parser=UsageSeries.from_response,
                 headers=headers,
                 data=data,
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as response:
-                response.raise_for_status()
-                result = await response.json()
-                return result
+            )
         except aiohttp.ClientError as err:
             _LOGGER.error("Error getting daily usage: %s", err)
             raise
 
-    async def get_pay_record(self) -> dict[str, Any]:
-        """Get payment records."""
-        session = await self._get_session()
+    async def get_pay_record(
+        self, start_date: str | None = None, end_date: str | None = None
+    ) -> dict[str, Any]:
+        """Get payment records, of the default window unless dates are given.
+
+        Args:
+            start_date: First day of the window (YYYY-MM-DD)
+            end_date: Last day of the window (YYYY-MM-DD)
+        """
         headers = {
             "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36",
             "content-type": "application/x-www-form-urlencoded",
@@ -166,20 +374,21 @@ class SycfgasAPIClient:
             "pagePath": "query/payRecordQuery/payRecordQuery",
             "clientVersion": "1.0.16",
             "channelType": "0",
-            "tenantId": "005600",
+            "tenantId": TENANT_ID,
             "userToken": self.user_token,
         }
+        if start_date and end_date:
+            params["startDate"] = start_date
+            params["endDate"] = end_date
 
         try:
-            async with session.get(
-                f"{API_BASE_URL}{API_PAY_RECORD}",
+            return await self._async_request(
+                "get",
+                API_PAY_RECORD,
+                f"{start_date}~{end_date}" if start_date and end_date else "",
                 headers=headers,
                 params=params,
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as response:
-                response.raise_for_status()
-                result = await response.json()
-                return result
+            )
         except aiohttp.ClientError as err:
             _LOGGER.error("Error getting pay record: %s", err)
             raise
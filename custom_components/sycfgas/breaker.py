@@ -0,0 +1,98 @@
+"""Circuit breaker for Sanya Changfeng Gas API endpoints."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Error to indicate a request was refused because the circuit is open."""
+
+
+class CircuitBreaker:
+    """Fail fast on an endpoint after repeated transient failures.
+
+    After failure_threshold consecutive failures the breaker opens and every
+    request is refused for reset_timeout seconds. It then goes half-open and
+    lets a single probe request through: success closes the breaker, failure
+    opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float) -> None:
+        """Initialize the breaker.
+
+        Args:
+            name: Endpoint the breaker protects
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds the breaker stays open before a probe
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Return the breaker state."""
+        if self._opened_at is None:
+            return STATE_CLOSED
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    def before_request(self) -> None:
+        """Raise CircuitOpenError unless a request may be sent now."""
+        state = self.state
+        if state == STATE_CLOSED:
+            return
+        if state == STATE_HALF_OPEN and not self._probing:
+            _LOGGER.debug("Circuit for %s is half-open, sending a probe", self.name)
+            self._probing = True
+            return
+        raise CircuitOpenError(f"Circuit for {self.name} is {state}")
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        if self._opened_at is not None:
+            _LOGGER.info("Circuit for %s closed", self.name)
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a transient failure, opening the breaker at the threshold."""
+        self.failures += 1
+        if self._probing or (
+            self._opened_at is None and self.failures >= self.failure_threshold
+        ):
+            _LOGGER.warning(
+                "Circuit for %s opened after %d failures, retrying in %ds",
+                self.name,
+                self.failures,
+                self.reset_timeout,
+            )
+            self._opened_at = time.monotonic()
+            self._probing = False
+
+    def release_probe(self) -> None:
+        """Let another probe through when the probe ended without an outcome."""
+        self._probing = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        state = self.state
+        data: dict[str, Any] = {"state": state, "failures": self.failures}
+        if state == STATE_OPEN and self._opened_at is not None:
+            data["retry_in"] = round(
+                self.reset_timeout - (time.monotonic() - self._opened_at), 1
+            )
+        return data
@@ -0,0 +1,147 @@
+"""Persistent cache for closed usage periods of Sanya Changfeng Gas."""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .models import UsageSeries
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 2
+SAVE_DELAY_SECONDS = 10
+
+
+def is_year_closed(year: str, now: datetime, grace_days: int) -> bool:
+    """Return True if a year can no longer change.
+
+    Args:
+        year: Year in format "YYYY"
+        now: Current local time
+        grace_days: Days after the year boundary during which the year is still re-fetched
+    """
+    year_end = datetime(int(year) + 1, 1, 1)
+    return now.replace(tzinfo=None) >= year_end + timedelta(days=grace_days)
+
+
+def is_month_closed(year_month: str, now: datetime, grace_days: int) -> bool:
+    """Return True if a month can no longer change.
+
+    Args:
+        year_month: Year and month in format "YYYY-MM"
+        now: Current local time
+        grace_days: Days after the month boundary during which the month is still re-fetched
+    """
+    year, month = (int(part) for part in year_month.split("-"))
+    if month == 12:
+        month_end = datetime(year + 1, 1, 1)
+    else:
+        month_end = datetime(year, month + 1, 1)
+    return now.replace(tzinfo=None) >= month_end + timedelta(days=grace_days)
+
+
+class _UsageStore(Store[dict[str, Any]]):
+    """Store that migrates older cache formats."""
+
+    async def _async_migrate_func(
+        self,
+        old_major_version: int,
+        old_minor_version: int,
+        old_data: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Migrate to the current version."""
+        if old_major_version == 1:
+            # Version 1 stored raw iotUsage responses
+            migrated: dict[str, Any] = {"years": {}, "months": {}}
+            for section in ("years", "months"):
+                for period, response in old_data.get(section, {}).items():
+                    series = UsageSeries.from_response(response)
+                    if series is not None:
+                        migrated[section][period] = series.as_dict()
+            return migrated
+        return old_data
+
+
+class SycfgasUsageCache:
+    """Cache of normalized usage for years and months that have ended.
+
+    Closed periods are written once and served from disk on later refreshes,
+    so only the open periods (and those inside the grace window) hit the API.
+    """
+
+    def __init__(self, hass: HomeAssistant, meter_uuid: str) -> None:
+        """Initialize the cache.
+
+        Args:
+            hass: Home Assistant instance
+            meter_uuid: Meter UUID the cached data belongs to
+        """
+        self._store = _UsageStore(hass, STORAGE_VERSION, f"{DOMAIN}.{meter_uuid}.usage")
+        self._years: dict[str, UsageSeries] = {}
+        self._months: dict[str, UsageSeries] = {}
+
+    async def async_load(self) -> None:
+        """Load cached periods from disk."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        self._years = {
+            year: UsageSeries.from_dict(series)
+            for year, series in stored.get("years", {}).items()
+        }
+        self._months = {
+            year_month: UsageSeries.from_dict(series)
+            for year_month, series in stored.get("months", {}).items()
+        }
+        _LOGGER.debug(
+            "Loaded %d cached years and %d cached months",
+            len(self._years),
+            len(self._months),
+        )
+
+    def get_year(self, year: str) -> UsageSeries | None:
+        """Return the cached monthly usage of a closed year."""
+        return self._years.get(year)
+
+    @property
+    def years(self) -> dict[str, UsageSeries]:
+        """Return the cached monthly usage of every closed year."""
+        return self._years
+
+    def get_month(self, year_month: str) -> UsageSeries | None:
+        """Return the cached daily usage of a closed month."""
+        return self._months.get(year_month)
+
+    @callback
+    def set_year(self, year: str, series: UsageSeries) -> None:
+        """Store the monthly usage of a closed year."""
+        self._years[year] = series
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY_SECONDS)
+
+    @callback
+    def set_month(self, year_month: str, series: UsageSeries) -> None:
+        """Store the daily usage of a closed month."""
+        self._months[year_month] = series
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY_SECONDS)
+
+    async def async_remove(self) -> None:
+        """Remove the cache file."""
+        self._years = {}
+        self._months = {}
+        await self._store.async_remove()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {
+            "years": {year: series.as_dict() for year, series in self._years.items()},
+            "months": {
+                year_month: series.as_dict()
+                for year_month, series in self._months.items()
+            },
+        }
@@ -7,12 +7,26 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DOMAIN
+from .const import (
+    CONF_CACHE_GRACE_DAYS,
+    CONF_COMPACT_ATTRIBUTES,
+    CONF_POLL_JITTER,
+    CONF_POLL_MODE,
+    DEFAULT_CACHE_GRACE_DAYS,
+    DEFAULT_COMPACT_ATTRIBUTES,
+    DEFAULT_POLL_JITTER,
+    DEFAULT_POLL_MODE,
+    DOMAIN,
+    POLL_MODE_ACCOUNT,
+    POLL_MODE_METER,
+    POLL_MODE_TENANT,
+)
 from .api_client import SycfgasAPIClient
+from .pool import async_acquire_pool, async_release_pool
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,9 +40,15 @@ STEP_USER_SCHEMA = vol.Schema(
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect."""
+    pool = async_acquire_pool(hass)
     api_client = SycfgasAPIClient(
         meter_uuid=data["meter_uuid"],
         user_token=data["user_token"],
+        session=pool.session,
+        limiter=pool.limiter,
+        in_flight=pool.in_flight,
+        breakers=pool.breakers,
+        transport=pool.transport,
     )
 
     try:
@@ -54,6 +74,8 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
         if isinstance(err, (InvalidAuth, CannotConnect)):
             raise
         raise CannotConnect from err
+    finally:
+        await async_release_pool(hass)
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -61,6 +83,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -101,6 +131,46 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle options for Sanya Changfeng Gas."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self._config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._config_entry.options
+        schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_CACHE_GRACE_DAYS,
+                    default=options.get(CONF_CACHE_GRACE_DAYS, DEFAULT_CACHE_GRACE_DAYS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=31)),
+                vol.Optional(
+                    CONF_POLL_MODE,
+                    default=options.get(CONF_POLL_MODE, DEFAULT_POLL_MODE),
+                ): vol.In([POLL_MODE_METER, POLL_MODE_ACCOUNT, POLL_MODE_TENANT]),
+                vol.Optional(
+                    CONF_POLL_JITTER,
+                    default=options.get(CONF_POLL_JITTER, DEFAULT_POLL_JITTER),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=60)),
+                vol.Optional(
+                    CONF_COMPACT_ATTRIBUTES,
+                    default=options.get(
+                        CONF_COMPACT_ATTRIBUTES, DEFAULT_COMPACT_ATTRIBUTES
+                    ),
+                ): bool,
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema)
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
@@ -9,9 +9,118 @@ API_ACCT_INFO = "/prod-api/acct/queryAcctInfo"
 API_IOT_USAGE = "/prod-api/query/iotUsage"
 API_PAY_RECORD = "/prod-api/query/v1/front/payRecord"
 
-# Update interval
+# Shared connection pool
+DATA_POOL = f"{DOMAIN}_pool"
+POOL_LIMIT = 100
+POOL_LIMIT_PER_HOST = 10
+POOL_DNS_CACHE_SECONDS = 300
+POOL_KEEPALIVE_SECONDS = 60
+
+# Request limiter shared by all API clients
+LIMITER_MAX_CONCURRENCY = 6  # Requests in flight at once
+LIMITER_RATE = 5.0  # Initial requests started per second
+LIMITER_MIN_RATE = 0.5
+LIMITER_MAX_RATE = 20.0
+LIMITER_BURST = 10
+LIMITER_LATENCY_TARGET = 3.0  # Seconds, slower responses make the limiter back off
+
+# Retries of transient failures (connection errors, timeouts, 429 and 5xx)
+RETRY_ATTEMPTS = 3  # Attempts per request, including the first one
+RETRY_BASE_DELAY = 0.5  # Seconds, doubled per retry with full jitter
+RETRY_MAX_DELAY = 5.0
+
+# Circuit breaker per endpoint
+BREAKER_FAILURE_THRESHOLD = 5  # Consecutive failures that open the circuit
+BREAKER_RESET_TIMEOUT = 120  # Seconds before a single probe request is sent
+
+# Update interval (scheduler tick, each data kind has its own interval below)
 SCAN_INTERVAL_SECONDS = 300  # 5 minutes
 
+# Data kinds, named after their key in coordinator.data
+KIND_ACCOUNT = "account_info"
+KIND_PAYMENTS = "pay_record"
+KIND_DAILY = "monthly_data"
+KIND_YEARLY = "yearly_usage"
+
+# Refresh interval per data kind
+REFRESH_INTERVALS = {
+    KIND_ACCOUNT: 300,  # 5 minutes
+    KIND_PAYMENTS: 3600,  # 1 hour
+    KIND_DAILY: 3 * 3600,  # 3 hours
+    KIND_YEARLY: 24 * 3600,  # 1 day
+}
+# A kind due within this many seconds of a tick is fetched on that tick
+SCHEDULE_SLACK_SECONDS = 5
+
+# Adaptive polling of daily usage around the learned publish window of new readings
+PUBLISH_LEARN_OBSERVATIONS = 14  # Arrivals of new readings the window is learned from
+PUBLISH_MIN_OBSERVATIONS = 3  # Arrivals needed before the window is used
+PUBLISH_MAX_UNCERTAINTY = 6 * 3600  # Arrivals known less precisely are not learned from
+PUBLISH_WINDOW_MARGIN = 900  # Seconds added before and after the window
+PUBLISH_WINDOW_INTERVAL = 300  # Seconds between checks inside the window
+PUBLISH_LATE_INTERVAL = 1800  # Seconds between checks after a window without a reading
+PUBLISH_IDLE_INTERVAL = 12 * 3600  # Longest wait between checks outside the window
+
+# First year with data, found once per meter and stored with the entry
+CONF_FIRST_YEAR = "first_year"
+CONF_FIRST_YEAR_CHECKED = "first_year_checked"
+DEFAULT_START_YEAR = 2016  # Earliest year the API has data for
+FIRST_YEAR_RECHECK_DAYS = 30
+
+# Older payment history is paged in the background in windows of this many days
+PAYMENT_BACKFILL_WINDOW_DAYS = 365
+
+# Options
+CONF_CACHE_GRACE_DAYS = "cache_grace_days"
+DEFAULT_CACHE_GRACE_DAYS = 3  # Keep re-fetching a just-closed month/year for 3 days
+CONF_POLL_MODE = "poll_mode"
+POLL_MODE_METER = "meter"  # Every entry polls on its own timer
+POLL_MODE_ACCOUNT = "account"  # Entries sharing a user token poll in one loop
+POLL_MODE_TENANT = "tenant"  # All entries of the tenant poll in one loop
+DEFAULT_POLL_MODE = POLL_MODE_METER
+CONF_POLL_JITTER = "poll_jitter"
+DEFAULT_POLL_JITTER = 0  # Seconds of random delay added to each poll
+CONF_COMPACT_ATTRIBUTES = "compact_attributes"
+DEFAULT_COMPACT_ATTRIBUTES = False  # Summaries instead of full breakdowns in attributes
+
+# Services
+SERVICE_GET_BREAKDOWN = "get_breakdown"
+SERVICE_GET_USAGE = "get_usage"
+SERVICE_RECORD_TRAFFIC = "record_traffic"
+ATTR_METER = "meter"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_GRANULARITY = "granularity"
+GRANULARITY_DAY = "day"
+GRANULARITY_MONTH = "month"
+GRANULARITY_YEAR = "year"
+USAGE_QUERY_MAX_DAYS = 366  # Longest range of daily usage returned by one query
+ATTR_DURATION = "duration"
+DEFAULT_RECORD_DURATION = 24 * 3600  # Seconds of traffic written to one cassette
+
+# Tenant of the Sanya Changfeng Gas self-service API
+TENANT_ID = "005600"
+
+# Polling groups
+DATA_GROUPS = f"{DOMAIN}_groups"
+GROUP_PARALLEL_METERS = 4  # Meters of a group refreshed at the same time
+
+# Currency of the imported gas cost statistics
+STATISTICS_CURRENCY = "CNY"
+
+# Upper bounds in seconds of the request and refresh latency histograms
+METRICS_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Number of relative monthly usage sensors (current month and the ones before)
+MONTH_SLOTS = 12
+
+# Number of months searched for the most recent day with usage
+RECENT_DAILY_MONTHS = 3
+
+# Rolling windows in days over the daily usage, for the average and runway sensors
+ROLLING_WINDOWS = (7, 30)
+ROLLING_RUNWAY_WINDOW = 30  # Window whose mean daily cost the balance runway uses
+
 # Sensor types
 SENSOR_BALANCE = "balance"
 SENSOR_YEARLY_USAGE = "yearly_usage"
@@ -2,151 +2,947 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Awaitable, Callable
+import hashlib
 import logging
-from datetime import datetime, timedelta
+import random
+import time
+from datetime import date, datetime, timedelta
 from dateutil.relativedelta import relativedelta
 from typing import Any
 
+import aiohttp
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api_client import SycfgasAPIClient
-from .const import DOMAIN, SCAN_INTERVAL_SECONDS
+from .breaker import CircuitOpenError
+from .cache import SycfgasUsageCache, is_month_closed, is_year_closed
+from .const import (
+    CONF_CACHE_GRACE_DAYS,
+    CONF_COMPACT_ATTRIBUTES,
+    CONF_FIRST_YEAR,
+    CONF_FIRST_YEAR_CHECKED,
+    CONF_POLL_JITTER,
+    CONF_POLL_MODE,
+    DATA_GROUPS,
+    DEFAULT_CACHE_GRACE_DAYS,
+    DEFAULT_COMPACT_ATTRIBUTES,
+    DEFAULT_POLL_JITTER,
+    DEFAULT_POLL_MODE,
+    DEFAULT_START_YEAR,
+    DOMAIN,
+    FIRST_YEAR_RECHECK_DAYS,
+    GRANULARITY_DAY,
+    GRANULARITY_YEAR,
+    GROUP_PARALLEL_METERS,
+    KIND_ACCOUNT,
+    KIND_DAILY,
+    KIND_PAYMENTS,
+    KIND_YEARLY,
+    MONTH_SLOTS,
+    PAYMENT_BACKFILL_WINDOW_DAYS,
+    POLL_MODE_ACCOUNT,
+    POLL_MODE_TENANT,
+    REFRESH_INTERVALS,
+    SCAN_INTERVAL_SECONDS,
+    SCHEDULE_SLACK_SECONDS,
+    TENANT_ID,
+)
+from .index import UsageIndex
+from .ledger import SycfgasPaymentLedger
+from .models import RESPONSE_CODE_OK, SliceState, UsageSeries
+from .pool import SycfgasConnectionPool, async_acquire_pool, async_release_pool
+from .schedule import SycfgasPublishSchedule
+from .snapshot import SycfgasSnapshot
+from .statistics import SycfgasStatisticsImporter
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class PhaseTimer:
+    """Run an action every interval at a stable phase offset.
+
+    The offset is derived from a key (the meter UUID or the group key), so
+    entries started at the same moment still poll at different points of
+    the interval, and an entry keeps its slot across restarts. An optional
+    random jitter is added on top of each slot.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        key: str,
+        interval: float,
+        jitter: float,
+        action: Callable[[], Awaitable[None]],
+    ) -> None:
+        """Initialize the timer."""
+        self.hass = hass
+        self.interval = interval
+        self.jitter = jitter
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        self.phase = int.from_bytes(digest, "big") / 2**64 * interval
+        self._action = action
+        self._unsub: CALLBACK_TYPE | None = None
+        # Set by async_stop, so a run in progress does not schedule the next one
+        self._stopped = True
+
+    @property
+    def next_slot(self) -> float:
+        """Return the next start of the timer's slot, in seconds since the epoch."""
+        now = time.time()
+        return now - ((now - self.phase) % self.interval) + self.interval
+
+    @callback
+    def async_start(self) -> None:
+        """Schedule the next run."""
+        self._stopped = False
+        delay = self.next_slot - time.time()
+        if self.jitter:
+            delay += random.uniform(0, self.jitter)
+        self._unsub = async_call_later(self.hass, delay, self._async_run)
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the next run."""
+        self._stopped = True
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    async def _async_run(self, _now: datetime) -> None:
+        """Run the action and schedule the next run."""
+        self._unsub = None
+        try:
+            await self._action()
+        finally:
+            if self._unsub is None and not self._stopped:
+                self.async_start()
+
+
+def _group_key(entry: ConfigEntry) -> str | None:
+    """Return the polling group of an entry, None if it polls on its own."""
+    poll_mode = entry.options.get(CONF_POLL_MODE, DEFAULT_POLL_MODE)
+    if poll_mode == POLL_MODE_ACCOUNT:
+        return f"{POLL_MODE_ACCOUNT}:{entry.data['user_token']}"
+    if poll_mode == POLL_MODE_TENANT:
+        return f"{POLL_MODE_TENANT}:{TENANT_ID}"
+    return None
+
+
 class SycfgasCoordinator(DataUpdateCoordinator):
     """Coordinator for Sanya Changfeng Gas data."""
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the coordinator."""
+        self.group_key = _group_key(entry)
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=SCAN_INTERVAL_SECONDS),
+            # Polling runs on a PhaseTimer of the meter or of its group
+            update_interval=None,
+            # Listeners are only notified when the returned data is a new object
+            always_update=False,
         )
         self.entry = entry
+        self._pool: SycfgasConnectionPool | None = async_acquire_pool(hass)
         self.api_client = SycfgasAPIClient(
             meter_uuid=entry.data["meter_uuid"],
             user_token=entry.data["user_token"],
+            session=self._pool.session,
+            limiter=self._pool.limiter,
+            in_flight=self._pool.in_flight,
+            breakers=self._pool.breakers,
+            transport=self._pool.transport,
         )
         self.meter_uuid = entry.data["meter_uuid"]
         self.user_name = entry.data.get("user_name", "未知用户")  # Fallback value
         self.meter_no = entry.data.get("meter_no", "")
+        self.usage_cache = SycfgasUsageCache(hass, self.meter_uuid)
+        self.payment_ledger = SycfgasPaymentLedger(hass, self.meter_uuid)
+        self.snapshot = SycfgasSnapshot(hass, self.meter_uuid)
+        # Slices restored from the snapshot and not fetched again since
+        self.restored_slices: set[tuple[str, str]] = set()
+        # Restored slices fetched again in the last update
+        self._confirmed: set[tuple[str, str]] = set()
+        self.publish_schedule = SycfgasPublishSchedule(hass, self.meter_uuid)
+        # Expected time of the next check for new daily readings
+        self.next_daily_fetch: datetime | None = None
+        self._next_daily_fetch_moved = False
+        self._backfill_task: asyncio.Task[None] | None = None
+        self.statistics = SycfgasStatisticsImporter(
+            hass, self.meter_no or self.meter_uuid, f"燃气表 {self.meter_no}".strip()
+        )
+        self.index = UsageIndex()
+        self.metrics = self.api_client.metrics
+        # Monotonic time at which each data kind is due again
+        self._next_due: dict[str, float] = {}
+        # Held for a whole refresh, DataUpdateCoordinator runs them concurrently
+        self._refresh_lock = asyncio.Lock()
+        # Fetch time and error count of each (kind, period) slice
+        self.slices: dict[tuple[str, str], SliceState] = {}
+        # Slices whose value changed in the last update, read by the sensors
+        self.changed_slices: set[tuple[str, str]] = set()
+        self.options = dict(entry.options)
+        self.cache_grace_days = entry.options.get(
+            CONF_CACHE_GRACE_DAYS, DEFAULT_CACHE_GRACE_DAYS
+        )
+        self.first_year: int | None = entry.data.get(CONF_FIRST_YEAR)
+        self.poll_jitter = entry.options.get(CONF_POLL_JITTER, DEFAULT_POLL_JITTER)
+        self.compact_attributes = entry.options.get(
+            CONF_COMPACT_ATTRIBUTES, DEFAULT_COMPACT_ATTRIBUTES
+        )
+        self._poll_timer = PhaseTimer(
+            hass,
+            self.meter_uuid,
+            SCAN_INTERVAL_SECONDS,
+            self.poll_jitter,
+            self._async_scheduled_refresh,
+        )
+
+    @callback
+    def async_start_polling(self) -> None:
+        """Start polling on the meter's own timer or in its group."""
+        if self.group_key is not None:
+            async_join_group(self.hass, self)
+        else:
+            self._poll_timer.async_start()
+
+    @property
+    def refreshing(self) -> bool:
+        """Return True while a refresh is running."""
+        return self._refresh_lock.locked()
+
+    async def _async_scheduled_refresh(self) -> None:
+        """Refresh on the meter's timer unless polling is disabled or a refresh runs."""
+        if self.entry.pref_disable_polling:
+            return
+        if self.refreshing:
+            _LOGGER.debug("Previous refresh of meter %s still running", self.meter_no)
+            return
+        await self.async_refresh()
+
+    async def async_load_cache(self) -> None:
+        """Load cached usage, the payment ledger and the publish schedule from disk."""
+        await self.usage_cache.async_load()
+        await self.payment_ledger.async_load()
+        await self.publish_schedule.async_load()
+
+    async def async_restore_snapshot(self) -> bool:
+        """Restore the last good data from disk, return False if there is none."""
+        restored = await self.snapshot.async_load()
+        if restored is None:
+            return False
+        data, fetched = restored
+        for key, fetched_at in fetched.items():
+            self.slices.setdefault(key, SliceState()).fetched_at = fetched_at
+        self.restored_slices = {(KIND_ACCOUNT, ""), (KIND_PAYMENTS, "")} | {
+            (kind, period) for kind in (KIND_YEARLY, KIND_DAILY) for period in data[kind]
+        }
+        self.data = data
+        self.index.update(data, self._periods(KIND_DAILY, datetime.now()))
+        _LOGGER.debug(
+            "Restored %d slices of meter %s from the snapshot",
+            len(self.restored_slices),
+            self.meter_no,
+        )
+        return True
+
+    async def async_refresh(self) -> None:
+        """Refresh data one refresh at a time.
+
+        Listeners are also notified when only the restored marks or the
+        schedule moved.
+        """
+        async with self._refresh_lock:
+            previous = self.data
+            await super().async_refresh()
+            if (
+                self._confirmed or self._next_daily_fetch_moved
+            ) and self.data == previous:
+                # Equal data skips the listeners, but the restored marks or the
+                # expected next fetch changed
+                self.async_update_listeners()
+
+    async def _async_get_year_usage(
+        self, year: str, now: datetime
+    ) -> UsageSeries | None:
+        """Get monthly usage for a year, served from cache once the year is closed."""
+        closed = is_year_closed(year, now, self.cache_grace_days)
+        if closed:
+            cached = self.usage_cache.get_year(year)
+            if cached is not None:
+                self.metrics.cache_hits += 1
+                return cached
+
+        self.metrics.cache_misses += 1
+        result = await self.api_client.get_monthly_usage(year)
+        if closed and result is not None:
+            self.usage_cache.set_year(year, result)
+        return result
+
+    async def _async_get_month_usage(
+        self, year_month: str, now: datetime
+    ) -> UsageSeries | None:
+        """Get daily usage for a month, served from cache once the month is closed."""
+        closed = is_month_closed(year_month, now, self.cache_grace_days)
+        if closed:
+            cached = self.usage_cache.get_month(year_month)
+            if cached is not None:
+                self.metrics.cache_hits += 1
+                return cached
+
+        self.metrics.cache_misses += 1
+        result = await self.api_client.get_daily_usage(year_month)
+        if closed and result is not None:
+            self.usage_cache.set_month(year_month, result)
+        return result
+
+    async def async_get_usage(
+        self, start: date, end: date, granularity: str
+    ) -> list[dict[str, Any]]:
+        """Return the usage between two dates, one row per day, month or year.
+
+        Periods are read from the coordinator data and the usage cache, and
+        only the ones missing from both are fetched through the limiter.
+        """
+        now = datetime.now()
+        end = min(end, now.date())
+        first_year = max(start.year, self.first_year or DEFAULT_START_YEAR)
+        if granularity == GRANULARITY_DAY:
+            kind = KIND_DAILY
+            periods = []
+            month = date(start.year, start.month, 1)
+            while month <= end:
+                if month.year >= first_year:
+                    periods.append(month.strftime("%Y-%m"))
+                month += relativedelta(months=1)
+            low, high = start.isoformat(), end.isoformat()
+        else:
+            kind = KIND_YEARLY
+            periods = [str(year) for year in range(first_year, end.year + 1)]
+            low, high = start.strftime("%Y-%m"), end.strftime("%Y-%m")
+
+        all_series = await asyncio.gather(
+            *(self._async_get_usage_series(kind, period, now) for period in periods)
+        )
+
+        rows: list[dict[str, Any]] = []
+        for period, series in zip(periods, all_series):
+            if series is None:
+                continue
+            records = [
+                record
+                for record in series.records
+                if low <= record.reading_time <= high
+            ]
+            if granularity == GRANULARITY_YEAR:
+                if records:
+                    rows.append(
+                        {
+                            "period": period,
+                            "volume": round(sum(r.volume for r in records), 3),
+                            "bill_amount": round(sum(r.bill_amount for r in records), 2),
+                        }
+                    )
+                continue
+            rows.extend(
+                {
+                    "period": record.reading_time,
+                    "volume": record.volume,
+                    "bill_amount": record.bill_amount,
+                }
+                for record in records
+            )
+        return rows
+
+    async def _async_get_usage_series(
+        self, kind: str, period: str, now: datetime
+    ) -> UsageSeries | None:
+        """Return a usage series from memory or the cache, fetching it if missing."""
+        series = (self.data or {}).get(kind, {}).get(period)
+        if series is not None:
+            return series
+        if kind == KIND_YEARLY:
+            return await self._async_get_year_usage(period, now)
+        return await self._async_get_month_usage(period, now)
+
+    def _due_kinds(self, now: float) -> list[str]:
+        """Return the data kinds whose next refresh is due."""
+        return [
+            kind
+            for kind in REFRESH_INTERVALS
+            if now
+            >= self._next_due.get(kind, 0.0) - SCHEDULE_SLACK_SECONDS - self.poll_jitter
+        ]
+
+    def _periods(self, kind: str, now: datetime) -> list[str]:
+        """Return the periods a data kind is made of."""
+        if kind == KIND_YEARLY:
+            # Query yearly usage from the meter's first year with data
+            start_year = min(self.first_year or DEFAULT_START_YEAR, now.year)
+            return [str(year) for year in range(start_year, now.year + 1)]
+        if kind == KIND_DAILY:
+            # Last 12 months of daily usage
+            return [
+                (now - relativedelta(months=i)).strftime("%Y-%m")
+                for i in range(MONTH_SLOTS)
+            ]
+        return [""]
+
+    def _first_year_check_due(self) -> bool:
+        """Return True if the first year with data should be looked up."""
+        if self.first_year is None:
+            return True
+        checked = dt_util.parse_datetime(
+            self.entry.data.get(CONF_FIRST_YEAR_CHECKED) or ""
+        )
+        return checked is None or dt_util.utcnow() - checked > timedelta(
+            days=FIRST_YEAR_RECHECK_DAYS
+        )
+
+    async def _async_has_usage(self, year: int, now: datetime) -> bool:
+        """Return True if a year has usage, raising if the query failed."""
+        series = await self._async_get_year_usage(str(year), now)
+        if series is None:
+            raise UpdateFailed(f"Invalid response for year {year}")
+        return series.has_usage
+
+    async def _async_scan_first_year(self, before: int, now: datetime) -> int:
+        """Return the first year with usage before a year, checking them in order."""
+        for year in range(DEFAULT_START_YEAR, before):
+            if await self._async_has_usage(year, now):
+                return year
+        return before
+
+    async def _async_search_first_year(self, now: datetime) -> int:
+        """Return the first year with usage by a binary search.
+
+        The search is capped by the earliest year the cache or the current
+        data already know to have usage. It assumes every year after the
+        first one has usage, so when no year with usage is found (a meter
+        that is no longer used), or a known or probed year without usage lies
+        after the year found, the years are scanned in order instead.
+        """
+        probes = {
+            int(year): series.has_usage
+            for year, series in self.usage_cache.years.items()
+        }
+        probes.update(
+            (int(year), series.has_usage)
+            for year, series in (self.data or {}).get(KIND_YEARLY, {}).items()
+        )
+        first_year: int | None = min(
+            (year for year, has_usage in probes.items() if has_usage),
+            default=None,
+        )
+        low = DEFAULT_START_YEAR
+        high = first_year - 1 if first_year is not None else now.year
+        while low <= high:
+            mid = (low + high) // 2
+            if mid not in probes:
+                probes[mid] = await self._async_has_usage(mid, now)
+            if probes[mid]:
+                first_year = mid
+                high = mid - 1
+            else:
+                low = mid + 1
+
+        if first_year is None:
+            _LOGGER.debug(
+                "No year with usage found for meter %s, scanning all years",
+                self.meter_no,
+            )
+            return await self._async_scan_first_year(now.year, now)
+
+        # The readings of the current year may not be published yet
+        if any(
+            first_year < year < now.year and not has_usage
+            for year, has_usage in probes.items()
+        ):
+            _LOGGER.debug(
+                "Meter %s has a year without usage after %s, scanning all years",
+                self.meter_no,
+                first_year,
+            )
+            first_year = await self._async_scan_first_year(first_year, now)
+        return first_year
+
+    async def _async_discover_first_year(self, now: datetime) -> None:
+        """Find the first year with data and store it with the entry.
+
+        The first lookup is a binary search over the years the API covers.
+        Later re-checks scan the years before the known first year one by one,
+        which are closed and mostly served from the cache, so a meter with a
+        gap year is still corrected.
+        """
+        first_year = self.first_year
+        try:
+            if first_year is None:
+                first_year = await self._async_search_first_year(now)
+            else:
+                first_year = await self._async_scan_first_year(first_year, now)
+        except Exception as err:  # pylint: disable=broad-except
+            # Keep scanning from the known (or default) start year for now
+            _LOGGER.debug("Could not determine first year with data: %s", err)
+            return
+
+        if first_year != self.first_year:
+            _LOGGER.info("First year with data for meter %s is %s", self.meter_no, first_year)
+        self.first_year = first_year
+        self.hass.config_entries.async_update_entry(
+            self.entry,
+            data={
+                **self.entry.data,
+                CONF_FIRST_YEAR: first_year,
+                CONF_FIRST_YEAR_CHECKED: dt_util.utcnow().isoformat(),
+            },
+        )
+
+    def _is_cached(self, kind: str, period: str, now: datetime) -> bool:
+        """Return True if a slice is served from the usage cache, not the API."""
+        if kind == KIND_YEARLY:
+            return (
+                is_year_closed(period, now, self.cache_grace_days)
+                and self.usage_cache.get_year(period) is not None
+            )
+        if kind == KIND_DAILY:
+            return (
+                is_month_closed(period, now, self.cache_grace_days)
+                and self.usage_cache.get_month(period) is not None
+            )
+        return False
+
+    async def _async_fetch_slice(self, kind: str, period: str, now: datetime) -> Any:
+        """Fetch one slice, raising if it has no usable value."""
+        if kind == KIND_ACCOUNT:
+            result = await self._async_fetch_account_info()
+        elif kind == KIND_PAYMENTS:
+            result = await self.api_client.get_pay_record()
+        elif kind == KIND_YEARLY:
+            result = await self._async_get_year_usage(period, now)
+        else:
+            result = await self._async_get_month_usage(period, now)
+
+        if result is None or (
+            isinstance(result, dict) and result.get("responseCode") != "100000"
+        ):
+            raise UpdateFailed("Invalid response")
+        return result
+
+    async def _async_fetch_account_info(self) -> dict[str, Any]:
+        """Fetch account balance information."""
+        account_info = await self.api_client.get_account_info()
+
+        # Update user_name from account info if available
+        if account_info and account_info.get("responseCode") == "100000":
+            result = account_info.get("result", {})
+            meter_info = result.get("meterInfo", {})
+            cust_name = meter_info.get("custName")
+            if cust_name and cust_name != "未知用户":
+                old_name = self.user_name
+                self.user_name = cust_name
+                if old_name != cust_name:
+                    _LOGGER.info("Updated user_name from '%s' to '%s'", old_name, cust_name)
+
+        return account_info
+
+    def _merge(
+        self,
+        data: dict[str, Any],
+        kind: str,
+        period: str,
+        result: Any,
+    ) -> None:
+        """Merge a successfully fetched slice into the data."""
+        if kind == KIND_PAYMENTS:
+            data[kind] = result
+            result_info = result.get("result") or {}
+            added = self.payment_ledger.async_merge_new(result_info.get("list") or [])
+            if added:
+                _LOGGER.debug("Added %d new payments to the ledger", added)
+            self._async_start_payment_backfill(result_info.get("startDate"))
+        elif kind == KIND_ACCOUNT:
+            data[kind] = result
+        elif kind == KIND_YEARLY and not result.has_usage:
+            # Only keep years with actual usage
+            _LOGGER.debug("Year %s has no valid usage data", period)
+            data[kind].pop(period, None)
+        else:
+            data[kind][period] = result
+
+    @callback
+    def _async_schedule_daily(
+        self, data: dict[str, Any], month_slots: list[str], loop_time: float
+    ) -> None:
+        """Learn from a check of the daily readings and schedule the next one.
+
+        Until the publish window is learned, daily usage keeps its fixed
+        refresh interval.
+        """
+        newest = max(
+            (
+                series.records[-1].reading_time
+                for year_month in month_slots[:2]
+                if (series := data[KIND_DAILY].get(year_month)) is not None
+                and series.records
+            ),
+            default=None,
+        )
+        now = dt_util.now()
+        self.publish_schedule.async_observe(newest, now)
+        delay = self.publish_schedule.next_delay(now)
+        if delay is None:
+            delay = REFRESH_INTERVALS[KIND_DAILY]
+        self._next_due[KIND_DAILY] = loop_time + delay
+        self.next_daily_fetch = now + timedelta(seconds=delay)
+        self._next_daily_fetch_moved = True
+
+    @callback
+    def _async_start_payment_backfill(self, start_date: str | None) -> None:
+        """Page through older payments in the background until the first year."""
+        ledger = self.payment_ledger
+        if ledger.backfill_done or (
+            self._backfill_task is not None and not self._backfill_task.done()
+        ):
+            return
+        before = ledger.backfill_before or start_date
+        if not before:
+            # The endpoint does not report its window, so it cannot be paged
+            ledger.async_set_backfill(None)
+            return
+        self._backfill_task = self.entry.async_create_background_task(
+            self.hass,
+            self._async_backfill_payments(before),
+            f"{DOMAIN} payment backfill {self.meter_no}",
+        )
+
+    async def _async_backfill_payments(self, before: str) -> None:
+        """Fetch payment windows older than before, newest first."""
+        ledger = self.payment_ledger
+        first_day = date(self.first_year or DEFAULT_START_YEAR, 1, 1)
+        while True:
+            before_day = dt_util.parse_date(str(before)[:10])
+            if before_day is None or before_day <= first_day:
+                ledger.async_set_backfill(None)
+                _LOGGER.debug("Payment backfill done, %d payments", len(ledger))
+                return
+            end = before_day - timedelta(days=1)
+            start = max(first_day, end - timedelta(days=PAYMENT_BACKFILL_WINDOW_DAYS - 1))
+            try:
+                response = await self.api_client.get_pay_record(
+                    start.isoformat(), end.isoformat()
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError, CircuitOpenError) as err:
+                # Continue from the same window after the next payment sync
+                _LOGGER.debug("Payment backfill paused before %s: %s", before, err)
+                return
+            if response.get("responseCode") != RESPONSE_CODE_OK:
+                _LOGGER.debug("Payment backfill paused before %s: %s", before, response)
+                return
+
+            result = response.get("result") or {}
+            if dt_util.parse_date(str(result.get("startDate", ""))[:10]) != start:
+                # The endpoint ignored the requested window
+                _LOGGER.debug("Payment record endpoint does not page, stopping backfill")
+                ledger.async_set_backfill(None)
+                return
+            if ledger.async_merge_older(result.get("list") or []):
+                self.changed_slices = {(KIND_PAYMENTS, "")}
+                self.async_update_listeners()
+            before = start.isoformat()
+            ledger.async_set_backfill(before)
+
+    @staticmethod
+    def _changed_slices(
+        previous: dict[str, Any], data: dict[str, Any]
+    ) -> set[tuple[str, str]]:
+        """Return the (kind, period) slices whose value object was replaced.
+
+        Unchanged responses are returned as the same parsed object, so an
+        identity check is enough to tell which slices changed.
+        """
+        changed = set()
+        for kind in (KIND_ACCOUNT, KIND_PAYMENTS):
+            if data[kind] is not previous.get(kind):
+                changed.add((kind, ""))
+        for kind in (KIND_YEARLY, KIND_DAILY):
+            old = previous.get(kind, {})
+            new = data[kind]
+            changed.update(
+                (kind, period)
+                for period in old.keys() | new.keys()
+                if old.get(period) is not new.get(period)
+            )
+        return changed
 
     async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from API."""
+        """Fetch the slices that are due and merge them into the current data.
+
+        Each (kind, period) slice keeps its last good value when fetching it
+        fails, and only the failed slices are retried on the next cycle.
+        """
+        self.changed_slices = set()
+        self._confirmed = set()
+        self._next_daily_fetch_moved = False
+        started = time.monotonic()
+        requests: list[tuple[str, str]] = []
         try:
-            # Get account balance and payment records in parallel
-            account_info_task = self.api_client.get_account_info()
-            pay_record_task = self.api_client.get_pay_record()
-            
-            account_info, pay_record = await asyncio.gather(
-                account_info_task,
-                pay_record_task,
+            now = datetime.now()
+            loop_time = time.monotonic()
+            due = self._due_kinds(loop_time)
+            if KIND_YEARLY in due and self._first_year_check_due():
+                await self._async_discover_first_year(now)
+            periods = {kind: self._periods(kind, now) for kind in REFRESH_INTERVALS}
+            if (
+                KIND_DAILY not in due
+                and self.index.month_slots
+                and self.index.month_slots != periods[KIND_DAILY]
+            ):
+                # The month rolled over, move the monthly sensors right away
+                due.append(KIND_DAILY)
+
+            requests = [
+                (kind, period)
+                for kind, kind_periods in periods.items()
+                for period in kind_periods
+                if kind in due
+                or (
+                    (slice_state := self.slices.get((kind, period))) is not None
+                    and slice_state.errors
+                )
+            ]
+            if not requests:
+                return self.data
+
+            _LOGGER.debug(
+                "Refreshing %s and %d failed slices",
+                ", ".join(due) or "nothing due",
+                sum(1 for kind, _ in requests if kind not in due),
+            )
+            changes = self.api_client.changes
+            cached = {
+                (kind, period)
+                for kind, period in requests
+                if self._is_cached(kind, period, now)
+            }
+            results = await asyncio.gather(
+                *(self._async_fetch_slice(kind, period, now) for kind, period in requests),
                 return_exceptions=True,
             )
-            
-            # Handle account_info exception
-            if isinstance(account_info, Exception):
-                _LOGGER.warning("Failed to get account info: %s", account_info)
-                account_info = {}
-            else:
-                # Update user_name from account info if available
-                if account_info and account_info.get("responseCode") == "100000":
-                    result = account_info.get("result", {})
-                    meter_info = result.get("meterInfo", {})
-                    cust_name = meter_info.get("custName")
-                    if cust_name and cust_name != "未知用户":
-                        old_name = self.user_name
-                        self.user_name = cust_name
-                        if old_name != cust_name:
-                            _LOGGER.info("Updated user_name from '%s' to '%s'", old_name, cust_name)
-            
-            # Handle payment record exception
-            if isinstance(pay_record, Exception):
-                _LOGGER.warning("Failed to get payment record: %s", pay_record)
-                pay_record = {}
-            
-            # Query yearly usage for all years from 2016 to current year
-            current_year = int(datetime.now().strftime("%Y"))
-            start_year = 2016
-            years = [str(year) for year in range(start_year, current_year + 1)]
-            
-            # Query all years in parallel
-            yearly_tasks = [
-                self.api_client.get_monthly_usage(year) for year in years
-            ]
-            yearly_results = await asyncio.gather(*yearly_tasks, return_exceptions=True)
-            
-            # Build yearly_usage dict, only include years with data
-            yearly_usage = {}
-            for year, result in zip(years, yearly_results):
-                if isinstance(result, Exception):
-                    _LOGGER.debug("No data for year %s: %s", year, result)
-                    continue
-                # Check if the response has data
-                if result and result.get("responseCode") == "100000":
-                    usage_data = result.get("result", {}).get("data", [])
-                    # Only include if data exists and has actual usage records
-                    if usage_data and isinstance(usage_data, list) and len(usage_data) > 0:
-                        # Double check: verify at least one record has valid volume
-                        has_valid_data = False
-                        for month_data in usage_data:
-                            volume = month_data.get("cycleTotalVolume", "0.0")
-                            try:
-                                if float(volume) > 0:
-                                    has_valid_data = True
-                                    break
-                            except (ValueError, TypeError):
-                                pass
-                        if has_valid_data:
-                            yearly_usage[year] = result
-                            _LOGGER.debug("Found data for year %s: %d months", year, len(usage_data))
-                        else:
-                            _LOGGER.debug("Year %s has no valid usage data", year)
-                    else:
-                        _LOGGER.debug("Year %s returned empty data array", year)
-                else:
-                    _LOGGER.debug("Year %s returned invalid response: %s", year, result.get("responseCode") if result else "None")
-            
-            # Get last 12 months of daily usage in parallel
-            current_date = datetime.now()
-            monthly_tasks = []
-            year_months = []
-            for i in range(12):
-                date = current_date - relativedelta(months=i)
-                year_month = date.strftime("%Y-%m")
-                year_months.append(year_month)
-                monthly_tasks.append(self.api_client.get_daily_usage(year_month))
-            
-            # Execute all monthly requests in parallel
-            monthly_results = await asyncio.gather(*monthly_tasks, return_exceptions=True)
-            
-            # Build monthly_data dict, handling exceptions
-            monthly_data = {}
-            for year_month, result in zip(year_months, monthly_results):
+            for kind in due:
+                self._next_due[kind] = loop_time + REFRESH_INTERVALS[kind]
+
+            # Slices keep their previous value unless fetched successfully
+            previous = self.data or {}
+            data: dict[str, Any] = {
+                KIND_ACCOUNT: previous.get(KIND_ACCOUNT, {}),
+                KIND_PAYMENTS: previous.get(KIND_PAYMENTS, {}),
+                KIND_YEARLY: {
+                    year: series
+                    for year, series in previous.get(KIND_YEARLY, {}).items()
+                    if year in periods[KIND_YEARLY]
+                },
+                KIND_DAILY: {
+                    year_month: series
+                    for year_month, series in previous.get(KIND_DAILY, {}).items()
+                    if year_month in periods[KIND_DAILY]
+                },
+            }
+            fetched_at = dt_util.utcnow()
+            failures = 0
+            # Restored slices fetched again, their sensors drop the restored mark
+            confirmed = self._confirmed
+            for (kind, period), result in zip(requests, results):
+                slice_state = self.slices.setdefault((kind, period), SliceState())
                 if isinstance(result, Exception):
-                    _LOGGER.warning("Failed to get daily usage for %s: %s", year_month, result)
+                    failures += 1
+                    slice_state.errors += 1
+                    slice_state.last_error = str(result) or type(result).__name__
+                    _LOGGER.debug(
+                        "Failed to get %s %s (%d errors), keeping last value: %s",
+                        kind,
+                        period,
+                        slice_state.errors,
+                        result,
+                    )
                     continue
-                monthly_data[year_month] = result
+                if (kind, period) not in cached:
+                    # Freshness of what the API last returned, for diagnostics
+                    slice_state.fetched_at = fetched_at
+                slice_state.errors = 0
+                slice_state.last_error = None
+                self._merge(data, kind, period, result)
+                if (kind, period) in self.restored_slices:
+                    self.restored_slices.discard((kind, period))
+                    confirmed.add((kind, period))
 
-            return {
-                "account_info": account_info,
-                "yearly_usage": yearly_usage,
-                "monthly_data": monthly_data,
-                "pay_record": pay_record if not isinstance(pay_record, Exception) else {},
+            # Forget slices that left the window
+            for key in [key for key in self.slices if key[1] not in periods[key[0]]]:
+                del self.slices[key]
+            self.restored_slices = {
+                key for key in self.restored_slices if key[1] in periods[key[0]]
             }
+
+            current_month = (KIND_DAILY, periods[KIND_DAILY][0])
+            if current_month in requests and not self.slices[current_month].errors:
+                self._async_schedule_daily(data, periods[KIND_DAILY], loop_time)
+
+            if failures:
+                _LOGGER.warning(
+                    "Failed to get %d of %d slices, keeping their last values",
+                    failures,
+                    len(requests),
+                )
+                if failures == len(requests) and not self.data:
+                    raise UpdateFailed(f"Error communicating with API: {results[0]}")
+
+            self.snapshot.async_save(
+                data,
+                {
+                    key: slice_state.fetched_at
+                    for key, slice_state in self.slices.items()
+                    if slice_state.fetched_at is not None
+                },
+            )
+
+            if (
+                self.data
+                and self.api_client.changes == changes
+                and self.index.month_slots == periods[KIND_DAILY]
+                and data[KIND_YEARLY].keys() == previous.get(KIND_YEARLY, {}).keys()
+                and not confirmed
+            ):
+                # Every response was byte-identical to the previous one, and no
+                # year was added or dropped when the first year moved
+                return self.data
+
+            self.changed_slices = self._changed_slices(previous, data) | confirmed
+            if self.index.month_slots != periods[KIND_DAILY]:
+                # Every monthly sensor moved to another month
+                self.changed_slices.update(
+                    (KIND_DAILY, year_month) for year_month in periods[KIND_DAILY]
+                )
+            self.index.update(data, periods[KIND_DAILY])
+            self.entry.async_create_background_task(
+                self.hass,
+                self.statistics.async_import(data[KIND_DAILY].values()),
+                f"{DOMAIN} statistics import {self.meter_no}",
+            )
+
+            return data
+        except UpdateFailed:
+            raise
         except Exception as err:
             # On error, return existing data to preserve state
             if self.data:
                 _LOGGER.warning("Error updating data, preserving existing data: %s", err)
                 return self.data
             raise UpdateFailed(f"Error communicating with API: {err}") from err
+        finally:
+            if requests:
+                self.metrics.record_refresh(time.monotonic() - started)
 
     async def async_shutdown(self) -> None:
         """Shutdown coordinator."""
+        self._poll_timer.async_stop()
+        async_leave_group(self.hass, self)
+        if self._backfill_task is not None:
+            self._backfill_task.cancel()
+        await super().async_shutdown()
         await self.api_client.close()
+        if self._pool is not None:
+            self._pool = None
+            await async_release_pool(self.hass)
+
+
+class SycfgasAccountCoordinator:
+    """Single polling loop that refreshes every meter of a group.
+
+    Grouped meter coordinators have no timer of their own. On each tick the
+    group refreshes its members a few at a time, every member fetching only
+    what its scheduler says is due through the shared pool limits, and each
+    member then notifies its own sensors.
+    """
+
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize the group."""
+        self.hass = hass
+        self.key = key
+        self.members: dict[str, SycfgasCoordinator] = {}
+        # The jitter is the largest poll_jitter option of the members
+        self._timer = PhaseTimer(
+            hass, key, SCAN_INTERVAL_SECONDS, 0, self._async_refresh_members
+        )
+        self._lock = asyncio.Lock()
+
+    @callback
+    def async_add_member(self, coordinator: SycfgasCoordinator) -> None:
+        """Add a meter to the group, starting the loop for the first one."""
+        start = not self.members
+        self.members[coordinator.entry.entry_id] = coordinator
+        self._timer.jitter = max(member.poll_jitter for member in self.members.values())
+        if start:
+            self._timer.async_start()
+
+    @callback
+    def async_remove_member(self, coordinator: SycfgasCoordinator) -> None:
+        """Remove a meter from the group, stopping the loop after the last one."""
+        self.members.pop(coordinator.entry.entry_id, None)
+        if not self.members:
+            self._timer.async_stop()
+            return
+        self._timer.jitter = max(member.poll_jitter for member in self.members.values())
+
+    async def _async_refresh_members(self) -> None:
+        """Refresh every member, a few meters at a time."""
+        if self._lock.locked():
+            _LOGGER.debug("Previous refresh of group %s still running", self.key)
+            return
+
+        async with self._lock:
+            semaphore = asyncio.Semaphore(GROUP_PARALLEL_METERS)
+
+            async def _async_refresh(member: SycfgasCoordinator) -> None:
+                async with semaphore:
+                    await member.async_refresh()
+
+            await asyncio.gather(
+                *(
+                    _async_refresh(member)
+                    for member in list(self.members.values())
+                    if not member.entry.pref_disable_polling and not member.refreshing
+                )
+            )
+
+
+@callback
+def async_join_group(hass: HomeAssistant, coordinator: SycfgasCoordinator) -> None:
+    """Add a grouped coordinator to the polling loop of its group."""
+    if coordinator.group_key is None:
+        return
+    groups: dict[str, SycfgasAccountCoordinator] = hass.data.setdefault(DATA_GROUPS, {})
+    group = groups.get(coordinator.group_key)
+    if group is None:
+        group = groups[coordinator.group_key] = SycfgasAccountCoordinator(
+            hass, coordinator.group_key
+        )
+    group.async_add_member(coordinator)
+
+
+@callback
+def async_leave_group(hass: HomeAssistant, coordinator: SycfgasCoordinator) -> None:
+    """Remove a coordinator from its polling group."""
+    groups: dict[str, SycfgasAccountCoordinator] = hass.data.get(DATA_GROUPS, {})
+    group = groups.get(coordinator.group_key or "")
+    if group is None:
+        return
+    group.async_remove_member(coordinator)
+    if not group.members:
+        del groups[group.key]
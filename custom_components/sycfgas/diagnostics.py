@@ -0,0 +1,79 @@
+"""Diagnostics support for Sanya Changfeng Gas."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_POOL, DOMAIN
+from .coordinator import SycfgasCoordinator
+from .pool import SycfgasConnectionPool
+
+TO_REDACT = {
+    "user_token",
+    "userToken",
+    "meter_uuid",
+    "meterUuid",
+    "meterUUID",
+    # Customer name and address
+    "user_name",
+    "userName",
+    "custName",
+    "user_address",
+    "userAddress",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: SycfgasCoordinator = hass.data[DOMAIN][entry.entry_id]
+    pool: SycfgasConnectionPool | None = hass.data.get(DATA_POOL)
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "years": sorted(coordinator.index.years),
+            "months": sorted(coordinator.index.months),
+            "payments": {
+                "count": len(coordinator.payment_ledger),
+                "last_pay_time": coordinator.payment_ledger.last_pay_time,
+                "backfill_done": coordinator.payment_ledger.backfill_done,
+                "backfill_before": coordinator.payment_ledger.backfill_before,
+            },
+            "restored_slices": sorted(
+                f"{kind}:{period}" if period else kind
+                for kind, period in coordinator.restored_slices
+            ),
+            "publish_schedule": {
+                **coordinator.publish_schedule.as_dict(),
+                "next_daily_fetch": coordinator.next_daily_fetch.isoformat()
+                if coordinator.next_daily_fetch
+                else None,
+            },
+            "rolling": coordinator.index.rolling.as_dict(),
+            "metrics": coordinator.metrics.as_dict(),
+            "slices": {
+                f"{kind}:{period}" if period else kind: slice_state.as_dict()
+                for (kind, period), slice_state in coordinator.slices.items()
+            },
+        },
+        "pool": {
+            "users": pool.users,
+            "limiter": pool.limiter.as_dict(),
+            "in_flight": len(pool.in_flight),
+            "breakers": {
+                endpoint: breaker.as_dict()
+                for endpoint, breaker in pool.breakers.items()
+            },
+        }
+        if pool is not None
+        else None,
+    }
@@ -0,0 +1,109 @@
+"""Precomputed aggregates read by the Sanya Changfeng Gas sensors."""
+from __future__ import annotations
+
+from typing import Any
+
+from .const import RECENT_DAILY_MONTHS, ROLLING_WINDOWS
+from .models import UsageRecord, UsageSeries
+from .rolling import RollingUsage
+
+
+class SeriesSummary:
+    """Totals, extremes and breakdown of one usage series."""
+
+    __slots__ = (
+        "series",
+        "total_volume",
+        "total_bill_amount",
+        "min_volume",
+        "max_volume",
+        "last_record",
+        "breakdown",
+    )
+
+    def __init__(self, series: UsageSeries) -> None:
+        """Compute the summary of a series."""
+        self.series = series
+        volumes = [record.volume for record in series.records]
+        self.total_volume = sum(volumes)
+        self.total_bill_amount = sum(record.bill_amount for record in series.records)
+        self.min_volume = min(volumes, default=None)
+        self.max_volume = max(volumes, default=None)
+        self.last_record = series.records[-1] if series.records else None
+        self.breakdown = {
+            record.reading_time: {
+                "volume": record.volume,
+                "bill_amount": record.bill_amount,
+            }
+            for record in series.records
+        }
+
+    def as_compact_dict(self) -> dict[str, Any]:
+        """Return the summary without the per-record breakdown."""
+        last_record = self.last_record
+        return {
+            "record_count": len(self.series.records),
+            "total_bill_amount": round(self.total_bill_amount, 2),
+            "min_volume": self.min_volume,
+            "max_volume": self.max_volume,
+            "last_reading_time": last_record.reading_time if last_record else None,
+            "last_volume": last_record.volume if last_record else None,
+            "last_bill_amount": last_record.bill_amount if last_record else None,
+        }
+
+
+class UsageIndex:
+    """Aggregates of the coordinator data, built once per refresh.
+
+    Every slice keeps a reference to the object it was computed from, so a
+    rebuild only recomputes the slices whose data object changed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self.years: dict[str, SeriesSummary] = {}
+        self.months: dict[str, SeriesSummary] = {}
+        self.latest_day: UsageRecord | None = None
+        # Year-month of each relative month slot, current month first
+        self.month_slots: list[str] = []
+        self.rolling = RollingUsage(ROLLING_WINDOWS)
+
+    def update(self, data: dict[str, Any], month_slots: list[str]) -> None:
+        """Rebuild the slices of the index whose data changed.
+
+        Args:
+            data: Coordinator data
+            month_slots: Year-months of the daily usage window, newest first
+        """
+        self.years = self._summarize(self.years, data.get("yearly_usage", {}))
+        self.months = self._summarize(self.months, data.get("monthly_data", {}))
+        self.month_slots = month_slots
+        self.rolling.update(
+            data.get("monthly_data", {}), month_slots[:RECENT_DAILY_MONTHS]
+        )
+
+        self.latest_day = None
+        for year_month in month_slots[:RECENT_DAILY_MONTHS]:
+            summary = self.months.get(year_month)
+            if summary is None:
+                continue
+            # Records are ordered by readingTime, walk them newest first
+            for record in reversed(summary.series.records):
+                if record.volume > 0:
+                    self.latest_day = record
+                    break
+            if self.latest_day is not None:
+                break
+
+    @staticmethod
+    def _summarize(
+        previous: dict[str, SeriesSummary], series_by_period: dict[str, UsageSeries]
+    ) -> dict[str, SeriesSummary]:
+        """Summarize series, reusing summaries whose series did not change."""
+        summaries = {}
+        for period, series in series_by_period.items():
+            summary = previous.get(period)
+            if summary is None or summary.series is not series:
+                summary = SeriesSummary(series)
+            summaries[period] = summary
+        return summaries
@@ -0,0 +1,189 @@
+"""Persistent payment ledger for Sanya Changfeng Gas."""
+from __future__ import annotations
+
+import bisect
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .models import to_float
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY_SECONDS = 10
+
+# Fields of a payRecord list item kept in the ledger
+PAYMENT_FIELDS = (
+    "payAmount",
+    "payTime",
+    "payStatus",
+    "payStatusDesc",
+    "payWayCode",
+    "payWayDesc",
+    "paySerialNo",
+    "meterNo",
+    "userName",
+    "userAddress",
+)
+
+
+def _payment_key(payment: dict[str, Any]) -> str:
+    """Return the ledger key of a payment."""
+    return payment.get("paySerialNo") or (
+        f"{payment.get('payTime', '')}|{payment.get('payAmount', '')}"
+    )
+
+
+def _pay_time(payment: dict[str, Any]) -> str:
+    """Return the sort key of a payment."""
+    return payment.get("payTime", "")
+
+
+class SycfgasPaymentLedger:
+    """Payments of a meter keyed by paySerialNo, ordered by payTime.
+
+    New syncs merge the payments of the current window, replacing stored
+    payments whose status or amount changed, and older history found by the
+    background backfill is merged in place.
+    """
+
+    def __init__(self, hass: HomeAssistant, meter_uuid: str) -> None:
+        """Initialize the ledger.
+
+        Args:
+            hass: Home Assistant instance
+            meter_uuid: Meter UUID the payments belong to
+        """
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{meter_uuid}.payments"
+        )
+        # Oldest first, so merging new payments appends at the end
+        self._payments: list[dict[str, Any]] = []
+        # Stored payment of each key
+        self._by_key: dict[str, dict[str, Any]] = {}
+        self._history: list[dict[str, Any]] | None = None
+        # Date before which the backfill continues, None once it is done
+        self.backfill_before: str | None = None
+        self.backfill_done = False
+
+    async def async_load(self) -> None:
+        """Load the ledger from disk."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        self._payments = sorted(stored.get("payments", []), key=_pay_time)
+        self._by_key = {_payment_key(payment): payment for payment in self._payments}
+        self._history = None
+        self.backfill_before = stored.get("backfill_before")
+        self.backfill_done = stored.get("backfill_done", False)
+
+    @property
+    def newest(self) -> dict[str, Any] | None:
+        """Return the most recent payment."""
+        return self._payments[-1] if self._payments else None
+
+    @property
+    def last_pay_time(self) -> str:
+        """Return the payTime of the most recent payment."""
+        return _pay_time(self._payments[-1]) if self._payments else ""
+
+    @property
+    def history(self) -> list[dict[str, Any]]:
+        """Return the payments newest first, formatted for state attributes."""
+        if self._history is None:
+            self._history = [
+                {
+                    "pay_amount": to_float(payment.get("payAmount", "0.0")),
+                    "pay_time": payment.get("payTime", ""),
+                    "pay_status": payment.get("payStatus", ""),
+                    "pay_status_desc": payment.get("payStatusDesc", ""),
+                    "pay_way": payment.get("payWayCode", ""),
+                    "pay_way_desc": payment.get("payWayDesc", ""),
+                    "pay_serial_no": payment.get("paySerialNo", ""),
+                    "meter_no": payment.get("meterNo", ""),
+                    "user_name": payment.get("userName", ""),
+                    "user_address": payment.get("userAddress", ""),
+                }
+                for payment in reversed(self._payments)
+            ]
+        return self._history
+
+    def __len__(self) -> int:
+        """Return the number of payments."""
+        return len(self._payments)
+
+    @callback
+    def async_merge_new(self, payment_list: list[dict[str, Any]]) -> int:
+        """Merge the payments of the latest sync.
+
+        Returns:
+            Number of payments added
+        """
+        return self._async_merge(payment_list)
+
+    @callback
+    def async_merge_older(self, payment_list: list[dict[str, Any]]) -> int:
+        """Merge payments found while paging through older history.
+
+        Returns:
+            Number of payments added
+        """
+        return self._async_merge(payment_list)
+
+    @callback
+    def async_set_backfill(self, before: str | None) -> None:
+        """Record where the backfill continues, None when it is done."""
+        self.backfill_before = before
+        self.backfill_done = before is None
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY_SECONDS)
+
+    async def async_remove(self) -> None:
+        """Remove the ledger file."""
+        self._payments = []
+        self._by_key = {}
+        self._history = None
+        await self._store.async_remove()
+
+    @callback
+    def _async_merge(self, payments: Any) -> int:
+        """Insert payments with a new key and replace the ones that changed.
+
+        Returns:
+            Number of payments whose key was not in the ledger yet
+        """
+        added = 0
+        changed = False
+        for payment in payments:
+            if not isinstance(payment, dict):
+                continue
+            key = _payment_key(payment)
+            stored = {field: payment[field] for field in PAYMENT_FIELDS if field in payment}
+            old = self._by_key.get(key)
+            if old == stored:
+                continue
+            if old is None:
+                added += 1
+            else:
+                # The API reports a new status or amount of a known payment
+                self._payments.remove(old)
+            self._by_key[key] = stored
+            bisect.insort(self._payments, stored, key=_pay_time)
+            changed = True
+
+        if changed:
+            self._history = None
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY_SECONDS)
+        return added
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {
+            "payments": self._payments,
+            "backfill_before": self.backfill_before,
+            "backfill_done": self.backfill_done,
+        }
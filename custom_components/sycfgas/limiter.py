@@ -0,0 +1,140 @@
+"""Adaptive request limiter for Sanya Changfeng Gas."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import logging
+import time
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def is_transient(err: BaseException) -> bool:
+    """Return True if a failed request points at an overloaded upstream."""
+    if isinstance(err, aiohttp.ClientResponseError):
+        return err.status == 429 or err.status >= 500
+    return isinstance(err, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+class AdaptiveRateLimiter:
+    """Concurrency limit plus token bucket whose rate adapts to the upstream.
+
+    The rate is halved when a request fails transiently or is slower than
+    the latency target, and grows again step by step while requests are fast and
+    successful (additive increase, multiplicative decrease).
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        rate: float,
+        min_rate: float,
+        max_rate: float,
+        burst: int,
+        latency_target: float,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            max_concurrency: Maximum number of requests in flight
+            rate: Initial number of requests started per second
+            min_rate: Lowest rate the limiter backs off to
+            max_rate: Highest rate the limiter speeds up to
+            burst: Number of tokens the bucket holds
+            latency_target: Latency in seconds above which the limiter backs off
+        """
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.latency_target = latency_target
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._backed_off_at = 0.0
+        self._waiting = 0
+        self._in_flight = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of requests waiting for a slot or a token."""
+        return self._waiting
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of requests currently running."""
+        return self._in_flight
+
+    def as_dict(self) -> dict[str, float | int]:
+        """Return the limiter state."""
+        return {
+            "rate": round(self.rate, 3),
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+        }
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait for a free slot and a token, then record how the request went."""
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+            try:
+                await self._async_take_token()
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        start = time.monotonic()
+        try:
+            yield
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            # A rejected token or a missing meter says nothing about the load
+            if is_transient(err):
+                self._record(time.monotonic() - start, False)
+            raise
+        else:
+            self._record(time.monotonic() - start, True)
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    async def _async_take_token(self) -> None:
+        """Take a token from the bucket, waiting for one if it is empty."""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst), self._tokens + (now - self._refilled_at) * self.rate
+            )
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def _record(self, latency: float, success: bool) -> None:
+        """Adapt the rate to the outcome of a request."""
+        now = time.monotonic()
+        if not success or latency > self.latency_target:
+            # Back off at most once per latency target so a burst of
+            # failures from the same moment only counts once
+            if now - self._backed_off_at >= self.latency_target:
+                self._backed_off_at = now
+                self.rate = max(self.min_rate, self.rate / 2)
+                _LOGGER.debug(
+                    "Backing off to %.2f requests/s (latency %.2fs, success %s, queue %d)",
+                    self.rate,
+                    latency,
+                    success,
+                    self.queue_depth,
+                )
+        elif self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + 1 / max(self.rate, 1))
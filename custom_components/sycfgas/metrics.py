@@ -0,0 +1,167 @@
+"""Request and refresh metrics for Sanya Changfeng Gas."""
+from __future__ import annotations
+
+import bisect
+from typing import Any
+
+from .const import METRICS_LATENCY_BUCKETS
+
+
+class LatencyHistogram:
+    """Cumulative histogram of durations in seconds."""
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: tuple[float, ...] = METRICS_LATENCY_BUCKETS) -> None:
+        """Initialize an empty histogram with the given upper bounds."""
+        self.bounds = bounds
+        # One count per bound plus one for durations above the last bound
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record a duration."""
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean duration."""
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """Return the upper bound of the bucket holding the q quantile."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        buckets = {f"le_{bound}": count for bound, count in zip(self.bounds, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean": _round(self.mean),
+            "p50": _round(self.quantile(0.5)),
+            "p95": _round(self.quantile(0.95)),
+            "max": _round(self.max),
+            "buckets": buckets,
+        }
+
+
+class EndpointMetrics:
+    """Counters and latency of one API endpoint."""
+
+    __slots__ = ("requests", "errors", "retries", "bytes", "latency")
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.latency = LatencyHistogram()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the endpoint metrics for diagnostics."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class SycfgasMetrics:
+    """Metrics of the requests and refreshes of one meter.
+
+    The API client records requests, bytes, errors, network and parse
+    time, and the coordinator records refresh wall time and cache lookups.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self.network_time = 0.0
+        self.parse_time = 0.0
+        self.parsed = 0
+        # Responses byte-identical to the previous one, not decoded again
+        self.unchanged = 0
+        # Calls that joined an identical request already in flight
+        self.coalesced = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.refresh = LatencyHistogram()
+        self.last_refresh_duration: float | None = None
+
+    def endpoint(self, endpoint: str) -> EndpointMetrics:
+        """Return the metrics of an endpoint."""
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+        return metrics
+
+    def record_refresh(self, seconds: float) -> None:
+        """Record the wall time of a refresh."""
+        self.refresh.observe(seconds)
+        self.last_refresh_duration = seconds
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests sent, retries included."""
+        return sum(metrics.requests for metrics in self.endpoints.values())
+
+    @property
+    def errors(self) -> int:
+        """Return the number of failed requests, retries included."""
+        return sum(metrics.errors for metrics in self.endpoints.values())
+
+    @property
+    def cache_hit_rate(self) -> float | None:
+        """Return the share of usage lookups served from the cache, in percent."""
+        lookups = self.cache_hits + self.cache_misses
+        return round(100 * self.cache_hits / lookups, 1) if lookups else None
+
+    @property
+    def mean_latency(self) -> float | None:
+        """Return the mean request latency over all endpoints in seconds."""
+        count = sum(metrics.latency.count for metrics in self.endpoints.values())
+        return self.network_time / count if count else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes": sum(metrics.bytes for metrics in self.endpoints.values()),
+            "network_time": _round(self.network_time),
+            "parse_time": _round(self.parse_time),
+            "parsed": self.parsed,
+            "unchanged": self.unchanged,
+            "coalesced": self.coalesced,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_rate": self.cache_hit_rate,
+            "last_refresh_duration": _round(self.last_refresh_duration),
+            "refresh": self.refresh.as_dict(),
+            "endpoints": {
+                endpoint: metrics.as_dict()
+                for endpoint, metrics in self.endpoints.items()
+            },
+        }
+
+
+def _round(value: float | None) -> float | None:
+    """Round a duration for display."""
+    return round(value, 4) if value is not None else None
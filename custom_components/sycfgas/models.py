@@ -0,0 +1,107 @@
+"""Normalized data models for Sanya Changfeng Gas."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+RESPONSE_CODE_OK = "100000"
+
+
+def to_float(value: Any) -> float:
+    """Convert an API number string to float, 0.0 if it is missing or invalid."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+class UsageRecord:
+    """Usage of one reading period (a day or a month)."""
+
+    __slots__ = ("reading_time", "volume", "bill_amount")
+
+    def __init__(self, reading_time: str, volume: float, bill_amount: float) -> None:
+        """Initialize the record."""
+        self.reading_time = reading_time
+        self.volume = volume
+        self.bill_amount = bill_amount
+
+    def __repr__(self) -> str:
+        """Return the representation."""
+        return f"UsageRecord({self.reading_time!r}, {self.volume}, {self.bill_amount})"
+
+
+class UsageSeries:
+    """Usage records of one iotUsage query, ordered by reading time.
+
+    Only the fields the integration uses are kept from the raw response.
+    """
+
+    __slots__ = ("records", "industry_type")
+
+    def __init__(self, records: tuple[UsageRecord, ...], industry_type: int = 0) -> None:
+        """Initialize the series."""
+        self.records = records
+        self.industry_type = industry_type
+
+    @classmethod
+    def from_response(cls, response: dict[str, Any]) -> UsageSeries | None:
+        """Normalize an iotUsage response, None if the query was not successful."""
+        if not response or response.get("responseCode") != RESPONSE_CODE_OK:
+            return None
+        result = response.get("result") or {}
+        usage_data = result.get("data") or []
+        records = [
+            UsageRecord(
+                item.get("readingTime", ""),
+                to_float(item.get("cycleTotalVolume")),
+                to_float(item.get("billAmt")),
+            )
+            for item in usage_data
+            if isinstance(item, dict)
+        ]
+        records.sort(key=lambda record: record.reading_time)
+        return cls(tuple(records), result.get("industryType", 0))
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> UsageSeries:
+        """Restore a series stored with as_dict."""
+        return cls(
+            tuple(UsageRecord(*record) for record in data["records"]),
+            data.get("industry_type", 0),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a compact JSON serializable representation."""
+        return {
+            "industry_type": self.industry_type,
+            "records": [
+                [record.reading_time, record.volume, record.bill_amount]
+                for record in self.records
+            ],
+        }
+
+    @property
+    def has_usage(self) -> bool:
+        """Return True if at least one record has a positive volume."""
+        return any(record.volume > 0 for record in self.records)
+
+
+class SliceState:
+    """Fetch bookkeeping of one (kind, period) slice of the coordinator data."""
+
+    __slots__ = ("fetched_at", "errors", "last_error")
+
+    def __init__(self) -> None:
+        """Initialize the state of a slice that was never fetched."""
+        self.fetched_at: datetime | None = None
+        self.errors = 0
+        self.last_error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state for diagnostics."""
+        return {
+            "fetched_at": self.fetched_at.isoformat() if self.fetched_at else None,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,111 @@
+"""Shared connection pool for Sanya Changfeng Gas."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.util import ssl as ssl_util
+
+from .const import (
+    DATA_POOL,
+    LIMITER_BURST,
+    LIMITER_LATENCY_TARGET,
+    LIMITER_MAX_CONCURRENCY,
+    LIMITER_MAX_RATE,
+    LIMITER_MIN_RATE,
+    LIMITER_RATE,
+    POOL_DNS_CACHE_SECONDS,
+    POOL_KEEPALIVE_SECONDS,
+    POOL_LIMIT,
+    POOL_LIMIT_PER_HOST,
+)
+from .api_client import InFlightRequests
+from .breaker import CircuitBreaker
+from .limiter import AdaptiveRateLimiter
+from .transport import HttpTransport, SycfgasTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SycfgasConnectionPool:
+    """Session, limiter, in-flight registry, breakers and transport shared by every API client.
+
+    The pool is reference counted: each config entry and each running config
+    flow holds a reference, and the session is closed when the last one is
+    released.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the pool."""
+        self._session: aiohttp.ClientSession | None = None
+        self.users = 0
+        self.unsub_close: Callable[[], None] | None = None
+        self.limiter = AdaptiveRateLimiter(
+            max_concurrency=LIMITER_MAX_CONCURRENCY,
+            rate=LIMITER_RATE,
+            min_rate=LIMITER_MIN_RATE,
+            max_rate=LIMITER_MAX_RATE,
+            burst=LIMITER_BURST,
+            latency_target=LIMITER_LATENCY_TARGET,
+        )
+        self.in_flight = InFlightRequests()
+        self.breakers: dict[str, CircuitBreaker] = {}
+        # Replaced by a ReplayTransport to run the clients against a cassette
+        self.transport: SycfgasTransport = HttpTransport()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=POOL_LIMIT,
+                limit_per_host=POOL_LIMIT_PER_HOST,
+                ttl_dns_cache=POOL_DNS_CACHE_SECONDS,
+                keepalive_timeout=POOL_KEEPALIVE_SECONDS,
+                # One SSL context for every connection lets OpenSSL reuse TLS sessions
+                ssl=ssl_util.get_default_context(),
+                enable_cleanup_closed=True,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def async_close(self) -> None:
+        """Close the session and its connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+def async_acquire_pool(hass: HomeAssistant) -> SycfgasConnectionPool:
+    """Return the shared pool and take a reference on it."""
+    pool: SycfgasConnectionPool | None = hass.data.get(DATA_POOL)
+    if pool is None:
+        pool = hass.data[DATA_POOL] = SycfgasConnectionPool()
+
+        async def _async_close_pool(event: Event) -> None:
+            """Close the pool when Home Assistant stops."""
+            await pool.async_close()
+
+        pool.unsub_close = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, _async_close_pool
+        )
+    pool.users += 1
+    return pool
+
+
+async def async_release_pool(hass: HomeAssistant) -> None:
+    """Drop a reference on the shared pool, closing it after the last one."""
+    pool: SycfgasConnectionPool | None = hass.data.get(DATA_POOL)
+    if pool is None:
+        return
+    pool.users -= 1
+    if pool.users <= 0:
+        hass.data.pop(DATA_POOL)
+        if pool.unsub_close is not None:
+            pool.unsub_close()
+        await pool.async_close()
+        _LOGGER.debug("Closed shared connection pool")
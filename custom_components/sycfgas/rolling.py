@@ -0,0 +1,133 @@
+"""Rolling averages of the daily usage of Sanya Changfeng Gas."""
+from __future__ import annotations
+
+import bisect
+from collections import deque
+from collections.abc import Iterable
+from datetime import date
+from operator import attrgetter
+from typing import Any
+
+from .models import UsageRecord, UsageSeries
+
+_reading_time = attrgetter("reading_time")
+
+
+class RollingWindow:
+    """Sums of the daily readings of the last few days.
+
+    The window ends at the newest reading pushed into it. Pushing a reading
+    adds it to the running sums and evicts the readings that fell out of the
+    window, so each reading is added and removed once.
+    """
+
+    __slots__ = ("days", "readings", "volume", "cost")
+
+    def __init__(self, days: int) -> None:
+        """Initialize an empty window.
+
+        Args:
+            days: Length of the window in days, the newest reading included
+        """
+        self.days = days
+        # (day ordinal, volume, cost), oldest first
+        self.readings: deque[tuple[int, float, float]] = deque()
+        self.volume = 0.0
+        self.cost = 0.0
+
+    def push(self, day: int, volume: float, cost: float) -> None:
+        """Add the reading of a day newer than every reading in the window."""
+        self.readings.append((day, volume, cost))
+        self.volume += volume
+        self.cost += cost
+        first_day = day - self.days + 1
+        while self.readings[0][0] < first_day:
+            _, old_volume, old_cost = self.readings.popleft()
+            self.volume -= old_volume
+            self.cost -= old_cost
+
+    @property
+    def average_volume(self) -> float | None:
+        """Return the mean daily volume of the readings in the window."""
+        if not self.readings:
+            return None
+        return max(self.volume, 0.0) / len(self.readings)
+
+    @property
+    def average_cost(self) -> float | None:
+        """Return the mean daily cost of the readings in the window."""
+        if not self.readings:
+            return None
+        return max(self.cost, 0.0) / len(self.readings)
+
+
+class RollingUsage:
+    """Rolling windows over the daily usage series of the coordinator data.
+
+    Only readings newer than the last one seen are pushed into the windows,
+    found by bisecting the ordered records of the newest months, so an
+    update costs a lookup per month plus one push per new reading. Readings
+    already pushed are not revisited if the API later corrects them.
+    """
+
+    def __init__(self, windows: Iterable[int]) -> None:
+        """Initialize empty windows.
+
+        Args:
+            windows: Window lengths in days
+        """
+        self.windows = {days: RollingWindow(days) for days in windows}
+        self.last_reading: str | None = None
+
+    def update(self, series_by_month: dict[str, UsageSeries], months: list[str]) -> int:
+        """Push the readings newer than the last one seen.
+
+        Args:
+            series_by_month: Daily usage series by year-month
+            months: Year-months to read, newest first
+
+        Returns:
+            Number of readings pushed
+        """
+        pushed = 0
+        for year_month in reversed(months):
+            series = series_by_month.get(year_month)
+            if series is None:
+                continue
+            last = self.last_reading
+            if last is not None and year_month < last[:7]:
+                continue
+            start = (
+                bisect.bisect_right(series.records, last, key=_reading_time)
+                if last is not None
+                else 0
+            )
+            for record in series.records[start:]:
+                if self._push(record):
+                    pushed += 1
+        return pushed
+
+    def _push(self, record: UsageRecord) -> bool:
+        """Push a reading into every window, False if it has no valid date."""
+        try:
+            day = date.fromisoformat(record.reading_time[:10]).toordinal()
+        except ValueError:
+            return False
+        for window in self.windows.values():
+            window.push(day, record.volume, record.bill_amount)
+        self.last_reading = record.reading_time
+        return True
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the windows for diagnostics."""
+        return {
+            "last_reading": self.last_reading,
+            **{
+                f"{days}d": {
+                    "readings": len(window.readings),
+                    "volume": round(window.volume, 3),
+                    "cost": round(window.cost, 2),
+                }
+                for days, window in self.windows.items()
+            },
+        }
@@ -0,0 +1,210 @@
+"""Learned publish window of the daily readings of Sanya Changfeng Gas."""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    PUBLISH_IDLE_INTERVAL,
+    PUBLISH_LATE_INTERVAL,
+    PUBLISH_LEARN_OBSERVATIONS,
+    PUBLISH_MAX_UNCERTAINTY,
+    PUBLISH_MIN_OBSERVATIONS,
+    PUBLISH_WINDOW_INTERVAL,
+    PUBLISH_WINDOW_MARGIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY_SECONDS = 10
+
+
+def _quantile(values: list[int], q: float) -> int:
+    """Return the q quantile of values by the nearest lower rank."""
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def _format_offset(seconds: int) -> str:
+    """Return seconds from midnight as HH:MM, wrapping around the day."""
+    minutes = (seconds // 60) % (24 * 60)
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class SycfgasPublishSchedule:
+    """When a meter's new daily readings show up, and when to look for them.
+
+    Each time a newer readingTime is seen, the arrival lies between the last
+    check that did not have it and the check that did. These intervals, in
+    seconds from the local midnight of the arrival day, are kept for the
+    last PUBLISH_LEARN_OBSERVATIONS arrivals. The window runs from the 10th
+    percentile of their starts to the 90th percentile of their ends, so one
+    odd day does not stretch it, and only precise arrivals are used once
+    there are enough of them. Checks are frequent inside the window and
+    rare once the day's reading has arrived.
+    """
+
+    def __init__(self, hass: HomeAssistant, meter_uuid: str) -> None:
+        """Initialize the schedule.
+
+        Args:
+            hass: Home Assistant instance
+            meter_uuid: Meter UUID the readings belong to
+        """
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{meter_uuid}.schedule"
+        )
+        # (start, end) of each arrival in seconds from its local midnight
+        self.observations: list[tuple[int, int]] = []
+        self.last_reading: str | None = None
+        self.last_checked: datetime | None = None
+        self.last_arrival: datetime | None = None
+
+    async def async_load(self) -> None:
+        """Load the observations from disk."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        self.observations = [
+            (start, end) for start, end in stored.get("observations", [])
+        ]
+        self.last_reading = stored.get("last_reading")
+        self.last_checked = dt_util.parse_datetime(stored.get("last_checked") or "")
+        self.last_arrival = dt_util.parse_datetime(stored.get("last_arrival") or "")
+
+    @property
+    def window(self) -> tuple[int, int] | None:
+        """Return the learned window in seconds from midnight, None while learning."""
+        observations = self.observations
+        # Arrivals seen by checks inside the window replace the rough ones
+        # seen while learning
+        precise = [
+            (start, end)
+            for start, end in observations
+            if end - start <= 2 * PUBLISH_WINDOW_INTERVAL
+        ]
+        if len(precise) >= PUBLISH_MIN_OBSERVATIONS:
+            observations = precise
+        if len(observations) < PUBLISH_MIN_OBSERVATIONS:
+            return None
+        return (
+            _quantile([start for start, _ in observations], 0.1),
+            _quantile([end for _, end in observations], 0.9),
+        )
+
+    @property
+    def window_text(self) -> str | None:
+        """Return the learned window as HH:MM-HH:MM."""
+        window = self.window
+        if window is None:
+            return None
+        return f"{_format_offset(window[0])}-{_format_offset(window[1])}"
+
+    @callback
+    def async_observe(self, newest_reading: str | None, now: datetime) -> bool:
+        """Record a successful check of the daily readings.
+
+        Args:
+            newest_reading: Newest readingTime of the fetched daily usage
+            now: Local time of the check
+
+        Returns:
+            True if a newer reading arrived since the previous check
+        """
+        arrived = (
+            newest_reading is not None
+            and self.last_reading is not None
+            and newest_reading > self.last_reading
+        )
+        if arrived:
+            self.last_arrival = now
+            previous = self.last_checked
+            if (
+                previous is not None
+                and (now - previous).total_seconds() <= PUBLISH_MAX_UNCERTAINTY
+            ):
+                midnight = dt_util.start_of_local_day(now)
+                self.observations.append(
+                    (
+                        int((previous - midnight).total_seconds()),
+                        int((now - midnight).total_seconds()),
+                    )
+                )
+                del self.observations[:-PUBLISH_LEARN_OBSERVATIONS]
+                _LOGGER.debug(
+                    "Reading %s arrived between %s and %s, window %s",
+                    newest_reading,
+                    previous,
+                    now,
+                    self.window_text,
+                )
+        if newest_reading is not None and (
+            self.last_reading is None or newest_reading > self.last_reading
+        ):
+            self.last_reading = newest_reading
+        self.last_checked = now
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY_SECONDS)
+        return arrived
+
+    def next_delay(self, now: datetime) -> float | None:
+        """Return seconds until the next check, None while still learning."""
+        window = self.window
+        if window is None:
+            return None
+        start, end = window
+        midnight = dt_util.start_of_local_day(now)
+        late = False
+        # The window of yesterday may reach past midnight, the one of tomorrow
+        # is the next to wait for once today's reading arrived
+        for days in (-1, 0, 1):
+            day = midnight + timedelta(days=days)
+            window_start = day + timedelta(seconds=start - PUBLISH_WINDOW_MARGIN)
+            window_end = day + timedelta(seconds=end + PUBLISH_WINDOW_MARGIN)
+            if self.last_arrival is not None and self.last_arrival >= window_start:
+                continue
+            if now > window_end:
+                # The window passed without a new reading
+                late = True
+                continue
+            if now >= window_start:
+                return PUBLISH_WINDOW_INTERVAL
+            return min(
+                (window_start - now).total_seconds(),
+                PUBLISH_LATE_INTERVAL if late else PUBLISH_IDLE_INTERVAL,
+            )
+        return PUBLISH_LATE_INTERVAL if late else PUBLISH_IDLE_INTERVAL
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the schedule for diagnostics."""
+        return {
+            "window": self.window_text,
+            "observations": [
+                f"{_format_offset(start)}-{_format_offset(end)}"
+                for start, end in self.observations
+            ],
+            "last_reading": self.last_reading,
+            "last_checked": self.last_checked.isoformat() if self.last_checked else None,
+            "last_arrival": self.last_arrival.isoformat() if self.last_arrival else None,
+        }
+
+    async def async_remove(self) -> None:
+        """Remove the schedule file."""
+        self.observations = []
+        await self._store.async_remove()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {
+            "observations": [list(observation) for observation in self.observations],
+            "last_reading": self.last_reading,
+            "last_checked": self.last_checked.isoformat() if self.last_checked else None,
+            "last_arrival": self.last_arrival.isoformat() if self.last_arrival else None,
+        }
@@ -2,20 +2,44 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
-from dateutil.relativedelta import relativedelta
+import re
+from abc import abstractmethod
+from collections.abc import Callable
+from datetime import datetime, timedelta
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.core import HomeAssistant, SupportsResponse, callback
+from homeassistant.helpers import entity_platform, entity_registry as er
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.const import UnitOfVolume
-
-from .const import DOMAIN
+from homeassistant.util import dt as dt_util
+from homeassistant.const import (
+    PERCENTAGE,
+    UnitOfInformation,
+    UnitOfTime,
+    UnitOfVolume,
+)
+
+from .const import (
+    DOMAIN,
+    KIND_ACCOUNT,
+    KIND_DAILY,
+    KIND_PAYMENTS,
+    KIND_YEARLY,
+    MONTH_SLOTS,
+    ROLLING_RUNWAY_WINDOW,
+    SERVICE_GET_BREAKDOWN,
+)
 from .coordinator import SycfgasCoordinator
+from .metrics import SycfgasMetrics
+from .rolling import RollingWindow
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,31 +57,16 @@ async def async_setup_entry(
     ]
 
     # Add yearly usage sensors for all years with data
-    # Data should already be available from async_config_entry_first_refresh in __init__.py
+    # Data is already available from the restored snapshot or the first refresh in __init__.py
     data = coordinator.data or {}
     yearly_usage = data.get("yearly_usage", {})
     # Only create entities for years that actually have data
     for year in sorted(yearly_usage.keys(), reverse=True):  # Most recent first
-        # Double check that the year has valid data before creating entity
-        year_data = yearly_usage.get(year, {})
-        usage_data = year_data.get("result", {}).get("data", [])
-        if usage_data and len(usage_data) > 0:
-            # Verify at least one month has valid volume > 0
-            has_valid_data = False
-            for month_data in usage_data:
-                volume = month_data.get("cycleTotalVolume", "0.0")
-                try:
-                    if float(volume) > 0:
-                        has_valid_data = True
-                        break
-                except (ValueError, TypeError):
-                    pass
-            if has_valid_data:
-                entities.append(SycfgasYearlyUsageSensor(coordinator, entry, year))
-            else:
-                _LOGGER.debug("Skipping year %s - no valid usage data (all volumes are 0)", year)
+        # Double check that the year has valid data (some volume > 0) before creating entity
+        if yearly_usage[year].has_usage:
+            entities.append(SycfgasYearlyUsageSensor(coordinator, entry, year))
         else:
-            _LOGGER.debug("Skipping year %s - no data array", year)
+            _LOGGER.debug("Skipping year %s - no valid usage data (all volumes are 0)", year)
 
     # Add payment record sensor
     entities.append(SycfgasPaymentSensor(coordinator, entry))
@@ -65,18 +74,164 @@ async def async_setup_entry(
     # Add recent daily usage sensor
     entities.append(SycfgasRecentDailyUsageSensor(coordinator, entry))
 
-    # Add monthly usage sensors for last 12 months
-    current_date = datetime.now()
-    for i in range(12):
-        date = current_date - relativedelta(months=i)
-        year_month = date.strftime("%Y-%m")
-        entities.append(SycfgasMonthlyUsageSensor(coordinator, entry, year_month))
+    # Add monthly usage sensors for the current month and the 11 before it
+    for offset in range(MONTH_SLOTS):
+        entities.append(SycfgasMonthlyUsageSensor(coordinator, entry, offset))
+
+    # Add rolling average and balance runway sensors
+    for key in ROLLING_SENSORS:
+        entities.append(SycfgasRollingAverageSensor(coordinator, entry, key))
+    entities.append(SycfgasBalanceRunwaySensor(coordinator, entry))
+
+    # Add diagnostic sensor for the learned publish window of daily readings
+    entities.append(SycfgasNextDailyFetchSensor(coordinator, entry))
+
+    # Add diagnostic sensors for request and refresh metrics
+    for key in METRIC_SENSORS:
+        entities.append(SycfgasMetricSensor(coordinator, entry, key))
+
+    _async_remove_calendar_month_entities(hass, entry, coordinator.meter_uuid)
 
     async_add_entities(entities)
 
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_GET_BREAKDOWN,
+        {},
+        "async_get_breakdown",
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def _round(value: float | None, digits: int) -> float | None:
+    """Round a metric, keeping None."""
+    return round(value, digits) if value is not None else None
+
+
+def _refresh_attributes(metrics: SycfgasMetrics) -> dict[str, Any]:
+    """Return the refresh time distribution and where the time went."""
+    return {
+        "count": metrics.refresh.count,
+        "p50": metrics.refresh.quantile(0.5),
+        "p95": metrics.refresh.quantile(0.95),
+        "network_time": round(metrics.network_time, 3),
+        "parse_time": round(metrics.parse_time, 3),
+    }
+
+
+def _latency_attributes(metrics: SycfgasMetrics) -> dict[str, Any]:
+    """Return the latency distribution of each endpoint."""
+    return {
+        endpoint: {
+            "count": endpoint_metrics.latency.count,
+            "p50": endpoint_metrics.latency.quantile(0.5),
+            "p95": endpoint_metrics.latency.quantile(0.95),
+        }
+        for endpoint, endpoint_metrics in metrics.endpoints.items()
+    }
+
+
+# key -> (name, unit, state class, value, attributes)
+METRIC_SENSORS: dict[
+    str,
+    tuple[
+        str,
+        str | None,
+        SensorStateClass,
+        Callable[[SycfgasMetrics], float | int | None],
+        Callable[[SycfgasMetrics], dict[str, Any]] | None,
+    ],
+] = {
+    "refresh_duration": (
+        "刷新耗时",
+        UnitOfTime.SECONDS,
+        SensorStateClass.MEASUREMENT,
+        lambda metrics: _round(metrics.last_refresh_duration, 3),
+        _refresh_attributes,
+    ),
+    "request_latency": (
+        "平均请求延迟",
+        UnitOfTime.MILLISECONDS,
+        SensorStateClass.MEASUREMENT,
+        lambda metrics: _round(
+            metrics.mean_latency * 1000 if metrics.mean_latency is not None else None, 1
+        ),
+        _latency_attributes,
+    ),
+    "requests": (
+        "请求次数",
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        lambda metrics: metrics.requests,
+        None,
+    ),
+    "request_errors": (
+        "请求错误次数",
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        lambda metrics: metrics.errors,
+        None,
+    ),
+    "received_bytes": (
+        "接收数据量",
+        UnitOfInformation.BYTES,
+        SensorStateClass.TOTAL_INCREASING,
+        lambda metrics: sum(m.bytes for m in metrics.endpoints.values()),
+        None,
+    ),
+    "cache_hit_rate": (
+        "缓存命中率",
+        PERCENTAGE,
+        SensorStateClass.MEASUREMENT,
+        lambda metrics: metrics.cache_hit_rate,
+        None,
+    ),
+}
+
+
+# key -> (name, unit, window days, value, digits)
+ROLLING_SENSORS: dict[
+    str, tuple[str, str, int, Callable[[RollingWindow], float | None], int]
+] = {
+    "volume_7d": (
+        "7日平均日用气量",
+        f"{UnitOfVolume.CUBIC_METERS}/天",
+        7,
+        lambda window: window.average_volume,
+        3,
+    ),
+    "volume_30d": (
+        "30日平均日用气量",
+        f"{UnitOfVolume.CUBIC_METERS}/天",
+        30,
+        lambda window: window.average_volume,
+        3,
+    ),
+    "cost_7d": ("7日平均日费用", "元/天", 7, lambda window: window.average_cost, 2),
+    "cost_30d": ("30日平均日费用", "元/天", 30, lambda window: window.average_cost, 2),
+}
+
+
+def _async_remove_calendar_month_entities(
+    hass: HomeAssistant, entry: ConfigEntry, meter_uuid: str
+) -> None:
+    """Remove monthly sensors that were keyed by a calendar year-month."""
+    registry = er.async_get(hass)
+    pattern = re.compile(rf"{re.escape(meter_uuid)}_monthly_\d{{4}}-\d{{2}}")
+    for registry_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if pattern.fullmatch(registry_entry.unique_id):
+            _LOGGER.debug("Removing calendar month entity %s", registry_entry.entity_id)
+            registry.async_remove(registry_entry.entity_id)
+
 
 class SycfgasBaseSensor(CoordinatorEntity, SensorEntity):
-    """Base class for Sanya Changfeng Gas sensor entities."""
+    """Base class for Sanya Changfeng Gas sensor entities.
+
+    Sensors that read coordinator slices carry restored, True while one of
+    them still holds the value restored from the snapshot at startup.
+    """
+
+    _unrecorded_attributes = frozenset({"restored"})
 
     def __init__(
         self,
@@ -87,6 +242,57 @@ class SycfgasBaseSensor(CoordinatorEntity, SensorEntity):
         super().__init__(coordinator)
         self.coordinator = coordinator
         self._entry = entry
+        # Availability, value and attributes of the last written state
+        self._written: tuple[bool, Any, dict[str, Any] | None] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._written = self._state_snapshot()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the sensor's own data changed."""
+        if (
+            self._written is not None
+            and self._written[0] == self.available
+            and not self._watches(self.coordinator.changed_slices)
+        ):
+            return
+        snapshot = self._state_snapshot()
+        if snapshot == self._written:
+            return
+        self._written = snapshot
+        self.async_write_ha_state()
+
+    def _slices(self) -> list[tuple[str, str]] | None:
+        """Return the slices the sensor reads, None if not tied to any."""
+        return None
+
+    def _watches(self, changed_slices: set[tuple[str, str]]) -> bool:
+        """Return True if the sensor reads one of the changed slices."""
+        slices = self._slices()
+        return slices is None or not changed_slices.isdisjoint(slices)
+
+    def _state_snapshot(self) -> tuple[bool, Any, dict[str, Any] | None]:
+        """Return what a state write would contain."""
+        return self.available, self.native_value, self.extra_state_attributes
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the sensor's attributes and whether its data is restored."""
+        attributes = self._attributes()
+        slices = self._slices()
+        if slices is None:
+            return attributes
+        return {
+            **(attributes or {}),
+            "restored": not self.coordinator.restored_slices.isdisjoint(slices),
+        }
+
+    def _attributes(self) -> dict[str, Any] | None:
+        """Return the sensor's own attributes."""
+        return None
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -99,6 +305,43 @@ class SycfgasBaseSensor(CoordinatorEntity, SensorEntity):
             serial_number=self.coordinator.meter_no,
         )
 
+    async def async_get_breakdown(self) -> dict[str, Any]:
+        """Return the full attributes for the get_breakdown service."""
+        return dict(self.extra_state_attributes or {})
+
+
+class SycfgasBreakdownSensor(SycfgasBaseSensor):
+    """Base class for sensors whose attributes hold a full breakdown.
+
+    The breakdown attributes are never written to the recorder. With the
+    compact attributes option the state carries a summary instead, and the
+    full attributes are returned by the get_breakdown service.
+    """
+
+    _unrecorded_attributes = SycfgasBaseSensor._unrecorded_attributes | {
+        "monthly_breakdown",
+        "daily_breakdown",
+        "payment_history",
+    }
+
+    def _attributes(self) -> dict[str, Any]:
+        """Return the full or compact attributes depending on the options."""
+        if self.coordinator.compact_attributes:
+            return self._compact_attributes()
+        return self._full_attributes()
+
+    async def async_get_breakdown(self) -> dict[str, Any]:
+        """Return the full attributes including the breakdown."""
+        return self._full_attributes()
+
+    @abstractmethod
+    def _full_attributes(self) -> dict[str, Any]:
+        """Return the attributes including the full breakdown."""
+
+    @abstractmethod
+    def _compact_attributes(self) -> dict[str, Any]:
+        """Return the attributes with a summary instead of the breakdown."""
+
 
 class SycfgasBalanceSensor(SycfgasBaseSensor):
     """Sensor for account balance."""
@@ -118,6 +361,10 @@ class SycfgasBalanceSensor(SycfgasBaseSensor):
         super().__init__(coordinator, entry)
         self._attr_unique_id = f"{coordinator.meter_uuid}_balance"
 
+    def _slices(self) -> list[tuple[str, str]]:
+        """Return the account info slice."""
+        return [(KIND_ACCOUNT, "")]
+
     @property
     def native_value(self) -> float | None:
         """Return the current balance."""
@@ -131,8 +378,7 @@ class SycfgasBalanceSensor(SycfgasBaseSensor):
         except (ValueError, TypeError):
             return None
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def _attributes(self) -> dict[str, Any]:
         """Return extra state attributes."""
         data = self.coordinator.data or {}
         account_info = data.get("account_info", {})
@@ -146,7 +392,7 @@ class SycfgasBalanceSensor(SycfgasBaseSensor):
         }
 
 
-class SycfgasYearlyUsageSensor(SycfgasBaseSensor):
+class SycfgasYearlyUsageSensor(SycfgasBreakdownSensor):
     """Sensor for yearly gas usage."""
 
     _attr_native_unit_of_measurement = UnitOfVolume.CUBIC_METERS
@@ -165,112 +411,124 @@ class SycfgasYearlyUsageSensor(SycfgasBaseSensor):
         self._attr_unique_id = f"{coordinator.meter_uuid}_yearly_{year}"
         self._attr_name = f"{year}年用气量"
 
+    def _slices(self) -> list[tuple[str, str]]:
+        """Return the slice of the year."""
+        return [(KIND_YEARLY, self.year)]
+
     @property
     def native_value(self) -> float | None:
         """Return the total yearly usage."""
-        data = self.coordinator.data or {}
-        yearly_usage = data.get("yearly_usage", {})
-        year_data = yearly_usage.get(self.year, {})
-        result = year_data.get("result", {})
-        usage_data = result.get("data", [])
-        
-        total = 0.0
-        for month_data in usage_data:
-            volume = month_data.get("cycleTotalVolume", "0.0")
-            try:
-                total += float(volume)
-            except (ValueError, TypeError):
-                pass
-        
-        return total if total > 0 else None
+        summary = self.coordinator.index.years.get(self.year)
+        if summary is None:
+            return None
+        return summary.total_volume if summary.total_volume > 0 else None
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def _full_attributes(self) -> dict[str, Any]:
         """Return extra state attributes with monthly breakdown."""
-        data = self.coordinator.data or {}
-        yearly_usage = data.get("yearly_usage", {})
-        year_data = yearly_usage.get(self.year, {})
-        result = year_data.get("result", {})
-        usage_data = result.get("data", [])
-        
-        monthly_breakdown = {}
-        for month_data in usage_data:
-            reading_time = month_data.get("readingTime", "")
-            volume = month_data.get("cycleTotalVolume", "0.0")
-            bill_amt = month_data.get("billAmt", "0.0")
-            monthly_breakdown[reading_time] = {
-                "volume": float(volume) if volume else 0.0,
-                "bill_amount": float(bill_amt) if bill_amt else 0.0,
-            }
-        
+        summary = self.coordinator.index.years.get(self.year)
+        if summary is None:
+            return {"monthly_breakdown": {}, "industry_type": 0}
+
         return {
-            "monthly_breakdown": monthly_breakdown,
-            "industry_type": result.get("industryType", 0),
+            "monthly_breakdown": summary.breakdown,
+            "industry_type": summary.series.industry_type,
         }
 
+    def _compact_attributes(self) -> dict[str, Any]:
+        """Return extra state attributes with a summary of the months."""
+        summary = self.coordinator.index.years.get(self.year)
+        if summary is None:
+            return {"industry_type": 0}
 
-class SycfgasMonthlyUsageSensor(SycfgasBaseSensor):
-    """Sensor for monthly gas usage."""
+        return {
+            **summary.as_compact_dict(),
+            "industry_type": summary.series.industry_type,
+        }
+
+
+class SycfgasMonthlyUsageSensor(SycfgasBreakdownSensor):
+    """Sensor for the gas usage of a month relative to the current one.
+
+    The sensor is keyed by its offset, not by a calendar month, and follows
+    the month slots of the usage index when the month rolls over. Only the
+    current month is a total for long-term statistics, reset at the start of
+    each month; the earlier slots show another month after every rollover.
+    """
 
     _attr_native_unit_of_measurement = UnitOfVolume.CUBIC_METERS
     _attr_icon = "mdi:fire"
-    _attr_state_class = SensorStateClass.TOTAL_INCREASING
 
     def __init__(
         self,
         coordinator: SycfgasCoordinator,
         entry: ConfigEntry,
-        year_month: str,
+        offset: int,
     ) -> None:
         """Initialize the monthly usage sensor."""
         super().__init__(coordinator, entry)
-        self.year_month = year_month
-        self._attr_unique_id = f"{coordinator.meter_uuid}_monthly_{year_month}"
-        # Format name like "2025年01月用气量"
-        year, month = year_month.split("-")
-        self._attr_name = f"{year}年{month}月用气量"
+        self.offset = offset
+        self._attr_unique_id = f"{coordinator.meter_uuid}_month_slot_{offset}"
+        if offset == 0:
+            self._attr_name = "本月用气量"
+            self._attr_state_class = SensorStateClass.TOTAL
+        elif offset == 1:
+            self._attr_name = "上月用气量"
+        else:
+            self._attr_name = f"{offset}个月前用气量"
+
+    def _slices(self) -> list[tuple[str, str]]:
+        """Return the slice of the slot's month."""
+        return [(KIND_DAILY, self.year_month)] if self.year_month else []
+
+    @property
+    def year_month(self) -> str | None:
+        """Return the year-month the slot currently points at."""
+        month_slots = self.coordinator.index.month_slots
+        return month_slots[self.offset] if self.offset < len(month_slots) else None
+
+    @property
+    def last_reset(self) -> datetime | None:
+        """Return the start of the current month for the current month's slot."""
+        if self.offset != 0 or self.year_month is None:
+            return None
+        return dt_util.start_of_local_day(
+            datetime.strptime(self.year_month, "%Y-%m").date()
+        )
 
     @property
     def native_value(self) -> float | None:
         """Return the total monthly usage."""
-        data = self.coordinator.data or {}
-        monthly_data = data.get("monthly_data", {})
-        month_data = monthly_data.get(self.year_month, {})
-        result = month_data.get("result", {})
-        usage_data = result.get("data", [])
-        
-        total = 0.0
-        for day_data in usage_data:
-            volume = day_data.get("cycleTotalVolume", "0.0")
-            try:
-                total += float(volume)
-            except (ValueError, TypeError):
-                pass
-        
-        return total if total > 0 else None
+        summary = self.coordinator.index.months.get(self.year_month)
+        if summary is None:
+            return None
+        return summary.total_volume if summary.total_volume > 0 else None
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def _full_attributes(self) -> dict[str, Any]:
         """Return extra state attributes with daily breakdown."""
-        data = self.coordinator.data or {}
-        monthly_data = data.get("monthly_data", {})
-        month_data = monthly_data.get(self.year_month, {})
-        result = month_data.get("result", {})
-        usage_data = result.get("data", [])
-        
-        daily_breakdown = {}
-        for day_data in usage_data:
-            reading_time = day_data.get("readingTime", "")
-            volume = day_data.get("cycleTotalVolume", "0.0")
-            bill_amt = day_data.get("billAmt", "0.0")
-            daily_breakdown[reading_time] = {
-                "volume": float(volume) if volume else 0.0,
-                "bill_amount": float(bill_amt) if bill_amt else 0.0,
+        summary = self.coordinator.index.months.get(self.year_month)
+        if summary is None:
+            return {
+                "year_month": self.year_month,
+                "daily_breakdown": {},
+                "industry_type": 0,
             }
-        
+
         return {
-            "daily_breakdown": daily_breakdown,
-            "industry_type": result.get("industryType", 0),
+            "year_month": self.year_month,
+            "daily_breakdown": summary.breakdown,
+            "industry_type": summary.series.industry_type,
+        }
+
+    def _compact_attributes(self) -> dict[str, Any]:
+        """Return extra state attributes with a summary of the days."""
+        summary = self.coordinator.index.months.get(self.year_month)
+        if summary is None:
+            return {"year_month": self.year_month, "industry_type": 0}
+
+        return {
+            "year_month": self.year_month,
+            **summary.as_compact_dict(),
+            "industry_type": summary.series.industry_type,
         }
 
 
@@ -292,103 +550,146 @@ class SycfgasRecentDailyUsageSensor(SycfgasBaseSensor):
         super().__init__(coordinator, entry)
         self._attr_unique_id = f"{coordinator.meter_uuid}_recent_daily_usage"
 
+    def _slices(self) -> list[tuple[str, str]]:
+        """Return the slice of the month holding the latest day."""
+        record = self.coordinator.index.latest_day
+        return [(KIND_DAILY, record.reading_time[:7])] if record is not None else []
+
+    def _watches(self, changed_slices: set[tuple[str, str]]) -> bool:
+        """Return True if the daily usage of any month changed."""
+        return any(kind == KIND_DAILY for kind, _ in changed_slices)
+
     @property
     def native_value(self) -> float | None:
         """Return the most recent daily usage."""
-        data = self.coordinator.data or {}
-        monthly_data = data.get("monthly_data", {})
-        
-        # Get current month and previous months to find the most recent data
-        current_date = datetime.now()
-        recent_usage = None
-        recent_date = None
-        
-        # Check last 3 months to find the most recent day with data
-        for i in range(3):
-            date = current_date - relativedelta(months=i)
-            year_month = date.strftime("%Y-%m")
-            month_data = monthly_data.get(year_month, {})
-            result = month_data.get("result", {})
-            usage_data = result.get("data", [])
-            
-            if usage_data and len(usage_data) > 0:
-                # Sort by readingTime descending to get most recent first
-                sorted_days = sorted(
-                    usage_data,
-                    key=lambda x: x.get("readingTime", ""),
-                    reverse=True
-                )
-                
-                # Find the most recent day with valid volume
-                for day_data in sorted_days:
-                    volume = day_data.get("cycleTotalVolume", "0.0")
-                    reading_time = day_data.get("readingTime", "")
-                    try:
-                        vol_float = float(volume)
-                        if vol_float > 0:
-                            # Check if this is more recent than what we found
-                            if recent_date is None or reading_time > recent_date:
-                                recent_usage = vol_float
-                                recent_date = reading_time
-                                break
-                    except (ValueError, TypeError):
-                        continue
-        
-        return recent_usage if recent_usage is not None else None
+        record = self.coordinator.index.latest_day
+        return record.volume if record is not None else None
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def _attributes(self) -> dict[str, Any]:
         """Return extra state attributes with recent daily details."""
-        data = self.coordinator.data or {}
-        monthly_data = data.get("monthly_data", {})
-        
-        # Get current month and previous months to find the most recent data
-        current_date = datetime.now()
-        recent_day_data = None
-        recent_date = None
-        
-        # Check last 3 months to find the most recent day with data
-        for i in range(3):
-            date = current_date - relativedelta(months=i)
-            year_month = date.strftime("%Y-%m")
-            month_data = monthly_data.get(year_month, {})
-            result = month_data.get("result", {})
-            usage_data = result.get("data", [])
-            
-            if usage_data and len(usage_data) > 0:
-                # Sort by readingTime descending to get most recent first
-                sorted_days = sorted(
-                    usage_data,
-                    key=lambda x: x.get("readingTime", ""),
-                    reverse=True
-                )
-                
-                # Find the most recent day with valid volume
-                for day_data in sorted_days:
-                    volume = day_data.get("cycleTotalVolume", "0.0")
-                    reading_time = day_data.get("readingTime", "")
-                    try:
-                        vol_float = float(volume)
-                        if vol_float > 0:
-                            # Check if this is more recent than what we found
-                            if recent_date is None or reading_time > recent_date:
-                                recent_day_data = day_data
-                                recent_date = reading_time
-                                break
-                    except (ValueError, TypeError):
-                        continue
-        
-        if recent_day_data:
+        record = self.coordinator.index.latest_day
+        if record is not None:
             return {
-                "reading_time": recent_day_data.get("readingTime", ""),
-                "volume": float(recent_day_data.get("cycleTotalVolume", "0.0")),
-                "bill_amount": float(recent_day_data.get("billAmt", "0.0")),
+                "reading_time": record.reading_time,
+                "volume": record.volume,
+                "bill_amount": record.bill_amount,
             }
-        
+
         return {}
 
 
-class SycfgasPaymentSensor(SycfgasBaseSensor):
+class SycfgasRollingAverageSensor(SycfgasBaseSensor):
+    """Sensor for the mean daily volume or cost over a rolling window."""
+
+    _attr_icon = "mdi:chart-line"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: SycfgasCoordinator,
+        entry: ConfigEntry,
+        key: str,
+    ) -> None:
+        """Initialize the rolling average sensor."""
+        super().__init__(coordinator, entry)
+        name, unit, days, value_fn, digits = ROLLING_SENSORS[key]
+        self._days = days
+        self._value_fn = value_fn
+        self._digits = digits
+        self._attr_unique_id = f"{coordinator.meter_uuid}_rolling_{key}"
+        self._attr_name = name
+        self._attr_native_unit_of_measurement = unit
+
+    def _slices(self) -> list[tuple[str, str]]:
+        """Return the slice of the month holding the newest reading."""
+        last_reading = self.coordinator.index.rolling.last_reading
+        return [(KIND_DAILY, last_reading[:7])] if last_reading else []
+
+    def _watches(self, changed_slices: set[tuple[str, str]]) -> bool:
+        """Return True if the daily usage of any month changed."""
+        return any(kind == KIND_DAILY for kind, _ in changed_slices)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the mean over the window."""
+        window = self.coordinator.index.rolling.windows[self._days]
+        return _round(self._value_fn(window), self._digits)
+
+    def _attributes(self) -> dict[str, Any]:
+        """Return the readings the mean is taken over."""
+        window = self.coordinator.index.rolling.windows[self._days]
+        return {
+            "window_days": self._days,
+            "readings": len(window.readings),
+            "last_reading": self.coordinator.index.rolling.last_reading,
+        }
+
+
+class SycfgasBalanceRunwaySensor(SycfgasBaseSensor):
+    """Sensor for the days until the balance runs out at the recent daily cost."""
+
+    _attr_name = "余额预计可用天数"
+    _attr_native_unit_of_measurement = UnitOfTime.DAYS
+    _attr_icon = "mdi:timer-sand"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: SycfgasCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the balance runway sensor."""
+        super().__init__(coordinator, entry)
+        self._attr_unique_id = f"{coordinator.meter_uuid}_balance_runway"
+
+    def _slices(self) -> list[tuple[str, str]]:
+        """Return the account info slice and the month of the newest reading."""
+        last_reading = self.coordinator.index.rolling.last_reading
+        slices = [(KIND_ACCOUNT, "")]
+        if last_reading:
+            slices.append((KIND_DAILY, last_reading[:7]))
+        return slices
+
+    def _watches(self, changed_slices: set[tuple[str, str]]) -> bool:
+        """Return True if the account info or the daily usage changed."""
+        return any(kind in (KIND_ACCOUNT, KIND_DAILY) for kind, _ in changed_slices)
+
+    def _balance(self) -> float | None:
+        """Return the account balance, None if unknown."""
+        data = self.coordinator.data or {}
+        result = data.get(KIND_ACCOUNT, {}).get("result") or {}
+        try:
+            return float(result["accountBalance"])
+        except (KeyError, ValueError, TypeError):
+            return None
+
+    def _daily_cost(self) -> float | None:
+        """Return the mean daily cost the runway is projected with."""
+        return self.coordinator.index.rolling.windows[ROLLING_RUNWAY_WINDOW].average_cost
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the days until the balance is used up."""
+        balance = self._balance()
+        daily_cost = self._daily_cost()
+        if balance is None or not daily_cost:
+            return None
+        return round(max(balance, 0.0) / daily_cost, 1)
+
+    def _attributes(self) -> dict[str, Any]:
+        """Return the projected depletion date and its inputs."""
+        days = self.native_value
+        daily_cost = self._daily_cost()
+        return {
+            "depletion_date": (dt_util.now().date() + timedelta(days=days)).isoformat()
+            if days is not None
+            else None,
+            "daily_cost": _round(daily_cost, 2),
+            "window_days": ROLLING_RUNWAY_WINDOW,
+        }
+
+
+class SycfgasPaymentSensor(SycfgasBreakdownSensor):
     """Sensor for recent payment record."""
 
     _attr_unique_id = "sycfgas_recent_payment"
@@ -406,70 +707,125 @@ class SycfgasPaymentSensor(SycfgasBaseSensor):
         super().__init__(coordinator, entry)
         self._attr_unique_id = f"{coordinator.meter_uuid}_recent_payment"
 
+    def _slices(self) -> list[tuple[str, str]]:
+        """Return the payment record slice."""
+        return [(KIND_PAYMENTS, "")]
+
     @property
     def native_value(self) -> float | None:
         """Return the most recent payment amount."""
-        data = self.coordinator.data or {}
-        pay_record = data.get("pay_record", {})
-        result = pay_record.get("result", {})
-        payment_list = result.get("list", [])
-        
-        if not payment_list or len(payment_list) == 0:
+        payment = self.coordinator.payment_ledger.newest
+        if payment is None:
             return None
-        
-        # Get the most recent payment (first item in list, sorted by payTime)
-        # Sort by payTime descending to get most recent first
-        sorted_payments = sorted(
-            payment_list,
-            key=lambda x: x.get("payTime", ""),
-            reverse=True
-        )
-        
-        most_recent = sorted_payments[0]
-        pay_amount = most_recent.get("payAmount", "0.0")
-        
+
+        pay_amount = payment.get("payAmount", "0.0")
+
         try:
             return float(pay_amount)
         except (ValueError, TypeError):
             return None
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def _full_attributes(self) -> dict[str, Any]:
         """Return extra state attributes with payment history."""
+        payment_history = self.coordinator.payment_ledger.history
+
+        return {
+            "payment_history": payment_history,
+            **self._record_attributes(),
+        }
+
+    def _compact_attributes(self) -> dict[str, Any]:
+        """Return extra state attributes with a summary of the payments."""
+        payment_history = self.coordinator.payment_ledger.history
+        amounts = [payment["pay_amount"] for payment in payment_history]
+
+        return {
+            "last_pay_time": payment_history[0]["pay_time"] if payment_history else None,
+            "min_pay_amount": min(amounts, default=None),
+            "max_pay_amount": max(amounts, default=None),
+            **self._record_attributes(),
+        }
+
+    def _record_attributes(self) -> dict[str, Any]:
+        """Return the attributes shared by the full and compact forms."""
         data = self.coordinator.data or {}
         pay_record = data.get("pay_record", {})
         result = pay_record.get("result", {})
-        payment_list = result.get("list", [])
-        
-        # Format payment history
-        payment_history = []
-        if payment_list:
-            # Sort by payTime descending
-            sorted_payments = sorted(
-                payment_list,
-                key=lambda x: x.get("payTime", ""),
-                reverse=True
-            )
-            
-            for payment in sorted_payments:
-                payment_history.append({
-                    "pay_amount": float(payment.get("payAmount", "0.0")),
-                    "pay_time": payment.get("payTime", ""),
-                    "pay_status": payment.get("payStatus", ""),
-                    "pay_status_desc": payment.get("payStatusDesc", ""),
-                    "pay_way": payment.get("payWayCode", ""),
-                    "pay_way_desc": payment.get("payWayDesc", ""),
-                    "pay_serial_no": payment.get("paySerialNo", ""),
-                    "meter_no": payment.get("meterNo", ""),
-                    "user_name": payment.get("userName", ""),
-                    "user_address": payment.get("userAddress", ""),
-                })
-        
+
         return {
-            "payment_history": payment_history,
-            "total_records": len(payment_history),
+            "total_records": len(self.coordinator.payment_ledger),
             "user_no": result.get("userNo", ""),
             "meter_no": result.get("meterNo", ""),
             "start_date": result.get("startDate", ""),
             "end_date": result.get("endDate", ""),
         }
+
+
+class SycfgasNextDailyFetchSensor(SycfgasBaseSensor):
+    """Diagnostic sensor for the expected next check for new daily readings."""
+
+    _attr_name = "每日用气量下次获取"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:calendar-clock"
+
+    def __init__(
+        self,
+        coordinator: SycfgasCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the next daily fetch sensor."""
+        super().__init__(coordinator, entry)
+        self._attr_unique_id = f"{coordinator.meter_uuid}_next_daily_fetch"
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return when new daily readings are looked for next."""
+        return self.coordinator.next_daily_fetch
+
+    def _attributes(self) -> dict[str, Any]:
+        """Return the learned publish window."""
+        schedule = self.coordinator.publish_schedule
+        return {
+            "publish_window": schedule.window_text,
+            "observations": len(schedule.observations),
+            "last_reading": schedule.last_reading,
+            "last_arrival": schedule.last_arrival.isoformat()
+            if schedule.last_arrival
+            else None,
+        }
+
+
+class SycfgasMetricSensor(SycfgasBaseSensor):
+    """Diagnostic sensor for a request or refresh metric."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_icon = "mdi:chart-timeline-variant"
+
+    def __init__(
+        self,
+        coordinator: SycfgasCoordinator,
+        entry: ConfigEntry,
+        key: str,
+    ) -> None:
+        """Initialize the metric sensor."""
+        super().__init__(coordinator, entry)
+        name, unit, state_class, value_fn, attributes_fn = METRIC_SENSORS[key]
+        self._value_fn = value_fn
+        self._attributes_fn = attributes_fn
+        self._attr_unique_id = f"{coordinator.meter_uuid}_metric_{key}"
+        self._attr_name = name
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the metric value."""
+        return self._value_fn(self.coordinator.metrics)
+
+    def _attributes(self) -> dict[str, Any] | None:
+        """Return the metric details."""
+        if self._attributes_fn is None:
+            return None
+        return self._attributes_fn(self.coordinator.metrics)
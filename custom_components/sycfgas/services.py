@@ -0,0 +1,175 @@
+"""Services and websocket commands for Sanya Changfeng Gas."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any
+
+import aiohttp
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .breaker import CircuitOpenError
+from .const import (
+    ATTR_DURATION,
+    ATTR_END,
+    ATTR_GRANULARITY,
+    ATTR_METER,
+    ATTR_START,
+    DATA_POOL,
+    DEFAULT_RECORD_DURATION,
+    DOMAIN,
+    GRANULARITY_DAY,
+    GRANULARITY_MONTH,
+    GRANULARITY_YEAR,
+    SERVICE_GET_USAGE,
+    SERVICE_RECORD_TRAFFIC,
+    USAGE_QUERY_MAX_DAYS,
+)
+from .coordinator import SycfgasCoordinator
+from .pool import SycfgasConnectionPool
+from .transport import Cassette, HttpTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+USAGE_QUERY_SCHEMA = {
+    vol.Required(ATTR_METER): cv.string,
+    vol.Required(ATTR_START): cv.date,
+    vol.Required(ATTR_END): cv.date,
+    vol.Optional(ATTR_GRANULARITY, default=GRANULARITY_DAY): vol.In(
+        [GRANULARITY_DAY, GRANULARITY_MONTH, GRANULARITY_YEAR]
+    ),
+}
+
+RECORD_TRAFFIC_SCHEMA = vol.Schema(
+    {
+        vol.Optional(
+            ATTR_DURATION, default=timedelta(seconds=DEFAULT_RECORD_DURATION)
+        ): cv.positive_time_period,
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant, meter: str) -> SycfgasCoordinator:
+    """Return the coordinator of a meter number or config entry ID."""
+    coordinator: SycfgasCoordinator
+    for entry_id, coordinator in hass.data.get(DOMAIN, {}).items():
+        if meter in (entry_id, coordinator.meter_no):
+            return coordinator
+    raise ServiceValidationError(f"Unknown meter {meter}")
+
+
+async def _async_query_usage(
+    hass: HomeAssistant, query: dict[str, Any]
+) -> dict[str, Any]:
+    """Validate a usage query and return its result."""
+    coordinator = _get_coordinator(hass, query[ATTR_METER])
+    start: date = query[ATTR_START]
+    end: date = query[ATTR_END]
+    granularity: str = query[ATTR_GRANULARITY]
+    if start > end:
+        raise ServiceValidationError("Start must not be after end")
+    if granularity == GRANULARITY_DAY and (end - start).days >= USAGE_QUERY_MAX_DAYS:
+        raise ServiceValidationError(
+            f"Daily usage can be queried for at most {USAGE_QUERY_MAX_DAYS} days"
+        )
+
+    try:
+        usage = await coordinator.async_get_usage(start, end, granularity)
+    except (aiohttp.ClientError, asyncio.TimeoutError, CircuitOpenError) as err:
+        raise HomeAssistantError(f"Error communicating with API: {err}") from err
+
+    return {
+        ATTR_METER: coordinator.meter_no,
+        ATTR_START: start.isoformat(),
+        ATTR_END: end.isoformat(),
+        ATTR_GRANULARITY: granularity,
+        "usage": usage,
+        "total_volume": round(sum(row["volume"] for row in usage), 3),
+        "total_bill_amount": round(sum(row["bill_amount"] for row in usage), 2),
+    }
+
+
+@callback
+def _async_record_traffic(hass: HomeAssistant, duration: timedelta) -> dict[str, Any]:
+    """Record the requests of every meter into a cassette for a while."""
+    pool: SycfgasConnectionPool | None = hass.data.get(DATA_POOL)
+    transport = pool.transport if pool is not None else None
+    if not isinstance(transport, HttpTransport):
+        raise ServiceValidationError("No meter is sending requests")
+    if transport.recording is not None:
+        raise ServiceValidationError("Traffic is already being recorded")
+
+    cassette = transport.recording = Cassette()
+    path = hass.config.path(f"{DOMAIN}_cassette_{dt_util.now():%Y%m%d_%H%M%S}.jsonl.gz")
+
+    async def _async_save(_now: datetime) -> None:
+        """Stop recording and write the cassette."""
+        if transport.recording is cassette:
+            transport.recording = None
+        await hass.async_add_executor_job(cassette.save, path)
+        _LOGGER.info("Saved %d recorded requests to %s", len(cassette), path)
+
+    async_call_later(hass, duration, _async_save)
+    return {"path": path, "until": (dt_util.now() + duration).isoformat()}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services and the get_usage websocket command."""
+
+    async def _async_get_usage(call: ServiceCall) -> ServiceResponse:
+        """Handle the get_usage service."""
+        return await _async_query_usage(hass, call.data)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_USAGE,
+        _async_get_usage,
+        schema=vol.Schema(USAGE_QUERY_SCHEMA),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def _async_record(call: ServiceCall) -> ServiceResponse:
+        """Handle the record_traffic service."""
+        return _async_record_traffic(hass, call.data[ATTR_DURATION])
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECORD_TRAFFIC,
+        _async_record,
+        schema=RECORD_TRAFFIC_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    websocket_api.async_register_command(hass, websocket_get_usage)
+
+
+@websocket_api.websocket_command(
+    {vol.Required("type"): f"{DOMAIN}/{SERVICE_GET_USAGE}", **USAGE_QUERY_SCHEMA}
+)
+@websocket_api.async_response
+async def websocket_get_usage(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return usage of a meter over a date range."""
+    try:
+        result = await _async_query_usage(hass, msg)
+    except HomeAssistantError as err:
+        connection.send_error(msg["id"], "get_usage_failed", str(err))
+        return
+    connection.send_result(msg["id"], result)
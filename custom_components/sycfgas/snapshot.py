@@ -0,0 +1,113 @@
+"""Persistent snapshot of the last good coordinator data of Sanya Changfeng Gas."""
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, KIND_ACCOUNT, KIND_DAILY, KIND_PAYMENTS, KIND_YEARLY
+from .models import UsageSeries
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY_SECONDS = 30
+
+
+def _slice_id(kind: str, period: str) -> str:
+    """Return the stored name of a (kind, period) slice."""
+    return f"{kind}:{period}" if period else kind
+
+
+class SycfgasSnapshot:
+    """Last good data of a meter, restored at startup before the first refresh.
+
+    The snapshot holds the raw account and payment responses, the normalized
+    usage series and the time every slice was fetched, so entities can be
+    created and marked with the age of their data without any request.
+    """
+
+    def __init__(self, hass: HomeAssistant, meter_uuid: str) -> None:
+        """Initialize the snapshot.
+
+        Args:
+            hass: Home Assistant instance
+            meter_uuid: Meter UUID the data belongs to
+        """
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{meter_uuid}.snapshot"
+        )
+        self._data: dict[str, Any] = {}
+        self._fetched: dict[tuple[str, str], datetime] = {}
+
+    async def async_load(
+        self,
+    ) -> tuple[dict[str, Any], dict[tuple[str, str], datetime]] | None:
+        """Load the snapshot and return the data and fetch time of each slice."""
+        stored = await self._store.async_load()
+        if not stored:
+            return None
+        data: dict[str, Any] = {
+            KIND_ACCOUNT: stored.get(KIND_ACCOUNT, {}),
+            KIND_PAYMENTS: stored.get(KIND_PAYMENTS, {}),
+            KIND_YEARLY: {
+                year: UsageSeries.from_dict(series)
+                for year, series in stored.get(KIND_YEARLY, {}).items()
+            },
+            KIND_DAILY: {
+                year_month: UsageSeries.from_dict(series)
+                for year_month, series in stored.get(KIND_DAILY, {}).items()
+            },
+        }
+        fetched: dict[tuple[str, str], datetime] = {}
+        for slice_id, fetched_at in stored.get("fetched_at", {}).items():
+            kind, _, period = slice_id.partition(":")
+            if (parsed := dt_util.parse_datetime(fetched_at)) is not None:
+                fetched[(kind, period)] = parsed
+        _LOGGER.debug(
+            "Loaded snapshot saved at %s with %d slices",
+            stored.get("saved_at"),
+            len(fetched),
+        )
+        return data, fetched
+
+    @callback
+    def async_save(
+        self, data: dict[str, Any], fetched: dict[tuple[str, str], datetime]
+    ) -> None:
+        """Schedule writing the data and the fetch time of each slice."""
+        self._data = data
+        self._fetched = fetched
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY_SECONDS)
+
+    async def async_remove(self) -> None:
+        """Remove the snapshot file."""
+        self._data = {}
+        self._fetched = {}
+        await self._store.async_remove()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        data = self._data
+        return {
+            "saved_at": dt_util.utcnow().isoformat(),
+            KIND_ACCOUNT: data.get(KIND_ACCOUNT, {}),
+            KIND_PAYMENTS: data.get(KIND_PAYMENTS, {}),
+            KIND_YEARLY: {
+                year: series.as_dict()
+                for year, series in data.get(KIND_YEARLY, {}).items()
+            },
+            KIND_DAILY: {
+                year_month: series.as_dict()
+                for year_month, series in data.get(KIND_DAILY, {}).items()
+            },
+            "fetched_at": {
+                _slice_id(kind, period): fetched_at.isoformat()
+                for (kind, period), fetched_at in self._fetched.items()
+            },
+        }
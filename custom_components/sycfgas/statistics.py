@@ -0,0 +1,134 @@
+"""Long-term statistics import for Sanya Changfeng Gas."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Iterable
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfVolume
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN, STATISTICS_CURRENCY
+from .models import UsageRecord, UsageSeries
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def statistic_ids(meter_key: str) -> tuple[str, str]:
+    """Return the volume and cost statistic IDs of a meter."""
+    meter_id = slugify(meter_key)
+    return f"{DOMAIN}:gas_volume_{meter_id}", f"{DOMAIN}:gas_cost_{meter_id}"
+
+
+class SycfgasStatisticsImporter:
+    """Push daily volume and cost of a meter into external statistics.
+
+    Every day is imported once as an hourly row starting at local midnight,
+    continuing the sum of the last imported row, so the Energy dashboard can
+    use the statistics. Today is skipped until its reading is complete.
+    """
+
+    def __init__(self, hass: HomeAssistant, meter_key: str, meter_name: str) -> None:
+        """Initialize the importer.
+
+        Args:
+            hass: Home Assistant instance
+            meter_key: Stable key of the meter used in the statistic IDs
+            meter_name: Name of the meter shown with the statistics
+        """
+        self.hass = hass
+        self.volume_id, self.cost_id = statistic_ids(meter_key)
+        self._meter_name = meter_name
+        self._lock = asyncio.Lock()
+        # Start timestamp and sum of the last row of each statistic
+        self._last: dict[str, tuple[float | None, float]] = {}
+
+    async def async_import(self, months: Iterable[UsageSeries]) -> int:
+        """Import the days newer than the last imported one.
+
+        Returns:
+            Number of days imported
+        """
+        async with self._lock:
+            today = dt_util.start_of_local_day()
+            days: list[tuple[float, UsageRecord]] = []
+            for series in months:
+                for record in series.records:
+                    day = dt_util.parse_date(record.reading_time)
+                    if day is None:
+                        continue
+                    start = dt_util.start_of_local_day(day)
+                    if start < today:
+                        days.append((start.timestamp(), record))
+            days.sort(key=lambda item: item[0])
+
+            imported = 0
+            for statistic_id, name, unit, value_of in (
+                (
+                    self.volume_id,
+                    f"{self._meter_name} 用气量",
+                    UnitOfVolume.CUBIC_METERS,
+                    lambda record: record.volume,
+                ),
+                (
+                    self.cost_id,
+                    f"{self._meter_name} 燃气费用",
+                    STATISTICS_CURRENCY,
+                    lambda record: record.bill_amount,
+                ),
+            ):
+                last_start, total = await self._async_get_last(statistic_id)
+                statistics: list[StatisticData] = []
+                for start, record in days:
+                    if last_start is not None and start <= last_start:
+                        continue
+                    value = value_of(record)
+                    total += value
+                    last_start = start
+                    statistics.append(
+                        StatisticData(
+                            start=dt_util.utc_from_timestamp(start),
+                            state=value,
+                            sum=total,
+                        )
+                    )
+                if not statistics:
+                    continue
+
+                async_add_external_statistics(
+                    self.hass,
+                    StatisticMetaData(
+                        has_mean=False,
+                        has_sum=True,
+                        name=name,
+                        source=DOMAIN,
+                        statistic_id=statistic_id,
+                        unit_of_measurement=unit,
+                    ),
+                    statistics,
+                )
+                self._last[statistic_id] = (last_start, total)
+                imported = max(imported, len(statistics))
+
+            if imported:
+                _LOGGER.debug("Imported %d days into %s", imported, self.volume_id)
+            return imported
+
+    async def _async_get_last(self, statistic_id: str) -> tuple[float | None, float]:
+        """Return the start and sum of the last row, read once from the recorder."""
+        if statistic_id not in self._last:
+            last = await get_instance(self.hass).async_add_executor_job(
+                get_last_statistics, self.hass, 1, statistic_id, True, {"sum"}
+            )
+            if rows := last.get(statistic_id):
+                self._last[statistic_id] = (rows[0]["start"], rows[0].get("sum") or 0.0)
+            else:
+                self._last[statistic_id] = (None, 0.0)
+        return self._last[statistic_id]
@@ -0,0 +1,314 @@
+"""Transports that send the requests of the Sanya Changfeng Gas API client.
+
+The HTTP transport sends requests with aiohttp and can record them into a
+cassette. The replay transport answers requests from a cassette instead,
+so recorded traffic can be run offline against the client and coordinator.
+"""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any
+from urllib.parse import urlencode
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+_LOGGER = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+REDACTED = "**REDACTED**"
+# Request fields left out of the cassette
+SECRET_FIELDS = ("userToken",)
+# Request fields replaced by a pseudonym in the cassette
+METER_FIELDS = ("meterUuid", "meterUUID")
+METER_ALIAS_PREFIX = "meter-"
+
+ERROR_TIMEOUT = "timeout"
+ERROR_CONNECTION = "connection"
+
+
+def _request_fields(kwargs: dict[str, Any]) -> dict[str, str]:
+    """Return the form and query fields of a request."""
+    fields: dict[str, str] = {}
+    for name in ("params", "data"):
+        values = kwargs.get(name)
+        if isinstance(values, dict):
+            fields.update({key: str(value) for key, value in values.items()})
+    return fields
+
+
+def meter_alias(meter_uuid: str) -> str:
+    """Return the pseudonym of a meter UUID in cassettes.
+
+    The pseudonym is a hash of the UUID, so recorded meters stay apart
+    without the UUID being readable. A pseudonym is returned unchanged,
+    which lets a cassette be replayed with its recorded meters.
+    """
+    if not meter_uuid or meter_uuid.startswith(METER_ALIAS_PREFIX):
+        return meter_uuid
+    digest = hashlib.blake2b(meter_uuid.encode(), digest_size=8).hexdigest()
+    return f"{METER_ALIAS_PREFIX}{digest}"
+
+
+def request_key(method: str, url: str, fields: dict[str, str]) -> str:
+    """Return the key that matches a request to its recorded response.
+
+    The key is made of the method, the endpoint path and every request field
+    except the secret ones, with the meter replaced by its pseudonym, so it
+    does not depend on the base URL or token.
+    """
+    query = urlencode(
+        sorted(
+            (key, meter_alias(value) if key in METER_FIELDS else value)
+            for key, value in fields.items()
+            if key not in SECRET_FIELDS
+        )
+    )
+    return f"{method.upper()} {URL(url).path}?{query}"
+
+
+class CassetteMissError(aiohttp.ClientResponseError):
+    """Error to indicate a replayed request has no recorded response."""
+
+
+class Cassette:
+    """Recorded request and response pairs.
+
+    Every interaction holds the request key, the meter pseudonym, the time
+    since the recording started, the request duration, and either the
+    response status and body or the kind of error. Cassettes are saved as
+    gzipped JSON lines.
+    """
+
+    def __init__(
+        self,
+        interactions: list[dict[str, Any]] | None = None,
+        recorded: str | None = None,
+    ) -> None:
+        """Initialize a cassette.
+
+        Args:
+            interactions: Recorded interactions, oldest first
+            recorded: Time the recording started (ISO 8601)
+        """
+        self.interactions = interactions if interactions is not None else []
+        self.recorded = recorded or datetime.now().astimezone().isoformat()
+        self._start = time.monotonic()
+
+    def __len__(self) -> int:
+        """Return the number of interactions."""
+        return len(self.interactions)
+
+    @property
+    def meters(self) -> list[str]:
+        """Return the meters with recorded requests, in order of appearance."""
+        return list(
+            dict.fromkeys(
+                interaction["meter"]
+                for interaction in self.interactions
+                if interaction.get("meter")
+            )
+        )
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        kwargs: dict[str, Any],
+        started: float,
+        status: int | None = None,
+        body: bytes | None = None,
+        error: str | None = None,
+    ) -> None:
+        """Record an interaction, leaving out the secrets and meter of the request.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            kwargs: Arguments of the aiohttp request
+            started: Monotonic time the request was sent
+            status: HTTP status of the response
+            body: Raw response body
+            error: ERROR_TIMEOUT or ERROR_CONNECTION if no response arrived
+        """
+        fields = _request_fields(kwargs)
+        meter = next((fields[key] for key in METER_FIELDS if key in fields), None)
+        interaction: dict[str, Any] = {
+            "key": request_key(method, url, fields),
+            "meter": meter_alias(meter) if meter else None,
+            "t": round(started - self._start, 3),
+            "d": round(time.monotonic() - started, 3),
+        }
+        if error is not None:
+            interaction["error"] = error
+        else:
+            text = (body or b"").decode("utf-8", errors="replace")
+            for key in SECRET_FIELDS:
+                if fields.get(key):
+                    text = text.replace(fields[key], REDACTED)
+            if meter:
+                text = text.replace(meter, interaction["meter"])
+            interaction["status"] = status
+            interaction["body"] = text
+        self.interactions.append(interaction)
+
+    def save(self, path: str) -> None:
+        """Write the cassette to a file."""
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            header = {"version": CASSETTE_VERSION, "recorded": self.recorded}
+            file.write(json.dumps(header, ensure_ascii=False) + "\n")
+            for interaction in self.interactions:
+                file.write(
+                    json.dumps(interaction, ensure_ascii=False, separators=(",", ":"))
+                    + "\n"
+                )
+
+    @classmethod
+    def load(cls, path: str) -> Cassette:
+        """Read a cassette from a file."""
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            header = json.loads(file.readline())
+            if header.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version {header.get('version')}")
+            interactions = [json.loads(line) for line in file if line.strip()]
+        return cls(interactions, header.get("recorded"))
+
+
+class SycfgasTransport(ABC):
+    """Send a request and return the raw response body."""
+
+    @abstractmethod
+    async def async_send(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        url: str,
+        **kwargs: Any,
+    ) -> bytes:
+        """Send a request, raising ClientResponseError on an error status."""
+
+
+class HttpTransport(SycfgasTransport):
+    """Send requests with aiohttp, recording them while a cassette is set."""
+
+    def __init__(self) -> None:
+        """Initialize the transport."""
+        self.recording: Cassette | None = None
+
+    async def async_send(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        url: str,
+        **kwargs: Any,
+    ) -> bytes:
+        """Send a request and return the raw body."""
+        cassette = self.recording
+        started = time.monotonic()
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                body = await response.read()
+                if cassette is not None:
+                    cassette.record(
+                        method, url, kwargs, started, status=response.status, body=body
+                    )
+                response.raise_for_status()
+                return body
+        except asyncio.TimeoutError:
+            if cassette is not None:
+                cassette.record(method, url, kwargs, started, error=ERROR_TIMEOUT)
+            raise
+        except aiohttp.ClientConnectionError:
+            if cassette is not None:
+                cassette.record(method, url, kwargs, started, error=ERROR_CONNECTION)
+            raise
+
+
+class ReplayTransport(SycfgasTransport):
+    """Answer requests from a cassette without any network access.
+
+    Interactions with the same request key are replayed in the order they
+    were recorded. Once they run out, the last one is repeated, so code that
+    polls more often than the recording still gets answers. With realtime
+    every response takes as long as the recorded request, scaled by speed,
+    otherwise responses are returned at once.
+    """
+
+    def __init__(self, cassette: Cassette, realtime: bool = False, speed: float = 1.0) -> None:
+        """Initialize the transport.
+
+        Args:
+            cassette: Recorded interactions to serve
+            realtime: Wait the recorded duration before each response
+            speed: Factor the recorded durations are divided by
+        """
+        self.realtime = realtime
+        self.speed = speed
+        self._queues: dict[str, deque[dict[str, Any]]] = {}
+        self._last: dict[str, dict[str, Any]] = {}
+        for interaction in cassette.interactions:
+            self._queues.setdefault(interaction["key"], deque()).append(interaction)
+        self.requests: Counter[str] = Counter()
+        self.errors = 0
+        # Totals since the start of the replay, not reset with the counters
+        self.repeated = 0
+        self.misses = 0
+
+    def reset_counters(self) -> None:
+        """Reset the request and error counters."""
+        self.requests.clear()
+        self.errors = 0
+
+    async def async_send(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        url: str,
+        **kwargs: Any,
+    ) -> bytes:
+        """Return the recorded response of a request."""
+        key = request_key(method, url, _request_fields(kwargs))
+        self.requests[URL(url).path] += 1
+        queue = self._queues.get(key)
+        if queue:
+            interaction = self._last[key] = queue.popleft()
+        elif key in self._last:
+            interaction = self._last[key]
+            self.repeated += 1
+        else:
+            self.misses += 1
+            self.errors += 1
+            _LOGGER.debug("No recorded response for %s", key)
+            raise CassetteMissError(
+                _request_info(method, url), (), status=404, message="Not in cassette"
+            )
+
+        if self.realtime:
+            await asyncio.sleep(interaction["d"] / self.speed)
+        if "error" in interaction:
+            self.errors += 1
+            if interaction["error"] == ERROR_TIMEOUT:
+                raise asyncio.TimeoutError
+            raise aiohttp.ClientConnectionError(f"Recorded connection error for {key}")
+        if interaction["status"] >= 400:
+            self.errors += 1
+            raise aiohttp.ClientResponseError(
+                _request_info(method, url), (), status=interaction["status"]
+            )
+        return interaction["body"].encode("utf-8")
+
+
+def _request_info(method: str, url: str) -> aiohttp.RequestInfo:
+    """Return request info for an error raised without a real request."""
+    return aiohttp.RequestInfo(
+        URL(url), method.upper(), CIMultiDictProxy(CIMultiDict()), URL(url)
+    )